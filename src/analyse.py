@@ -9,31 +9,94 @@
     uv run src/analyse.py > test/data/_result.log
     uv run src/analyse.py -l de > test/data/_result-de.log
     uv run src/analyse.py -l en > test/data/_result-en.log
+
+    uv run src/analyse.py -w 8                               # process pool (8 processes)
+    uv run src/analyse.py -w 8 -p data/video/<channel>
+    uv run src/analyse.py -c -w 8 -p data/video/<channel>   # only new or modified files (<path>/analyse.sqlite)
+    uv run src/analyse.py -c --hash -p data/video/<channel> # + content hash: touched or copied files from the cache
+                                                             # cache: summary report only (-c / -w), not the detailed report, not -A
+
+    uv run src/analyse.py -x data/formats.columns -p data/video/<channel>   # columnar format table
+    uv sync --extra columns                                                 # optional numpy: vectorised -s queries
+    uv run src/analyse.py -s av01:1080 -i data/formats.columns              # share of videos with av01 >= 1080p per channel
+    uv run src/analyse.py -s vp9 -p data/video/<channel>
+
+    uv run src/analyse.py -A                                 # all languages in one pass (table)
+    uv run src/analyse.py -A -o test/data/_languages.json    # all languages in one pass (json)
 """
 from __future__ import annotations
 
 import sys
 
+from pathlib import Path
+
 import click
 
 # helper
-from src.helper.analyse import analyse_json_all
+from src.helper.analyse import analyse_json_all, analyse_json_parallel, analyse_languages_all, report_languages, report_results
+from src.helper.analysis_cache import AnalysisCache
+from src.helper.columns import codec_share, columns_from_folder, load_columns, report_share, save_columns
 
 # utils
+from src.utils.file import export_json
 from src.utils.globals import BASE_PATH
+from src.utils.prefs import Prefs
 from src.utils.trace import Trace
 
 TEST_DIR = BASE_PATH / "test" / "data"
 
 @click.command()
 @click.option("-l",  "--language", help="force audio language 'de', 'en', 'null'", default="")
+@click.option("-A",  "--all-languages", "all_languages", is_flag=True, help="best audio of every language in one pass")
+@click.option("-o",  "--output", type=click.Path(dir_okay=False), help="all languages: json file instead of the table")
+@click.option("-w",  "--workers", type=click.IntRange(min=1), default=1, show_default=True, help="processes (> 1: summary report)")
+@click.option("-p",  "--path", type=click.Path(file_okay=False, exists=True, path_type=Path), default=TEST_DIR, help="folder of the info json files")
+@click.option("-c",  "--cache", is_flag=True, help="results of unchanged files from <path>/analyse.sqlite (summary report, not with -A)")
+@click.option("--hash", "use_hash", is_flag=True, help="cache: same content (hash) -> unchanged, even with a new mtime")
+
+@click.option("-x",  "--export", "export", type=click.Path(dir_okay=False, path_type=Path), help="columnar format table of all files (faster queries with numpy: uv sync --extra columns)")
+@click.option("-i",  "--columns", "columns_file", type=click.Path(dir_okay=False, exists=True, path_type=Path), help="columnar format table (instead of the json files)")
+@click.option("-s",  "--share", help="share of videos with CODEC[:MIN_HEIGHT] per channel, e.g. 'av01:1080'")
 
-def main(language: str) -> None:
+def main(language: str, all_languages: bool, output: str | None, workers: int, path: Path, *, cache: bool, use_hash: bool, export: Path | None, columns_file: Path | None, share: str | None) -> None:
     Trace.set(show_caller=True, show_timestamp=False)
 
-    analyse_json_all( TEST_DIR, language=language )
+    if export or share:
+        columns = load_columns( columns_file ) if columns_file else columns_from_folder( path )
+        if export:
+            save_columns( columns, export )
+        if share:
+            codec, _, height = share.partition(":")
+            if not (height or "0").isdigit():
+                msg = f"'{share}' - expected CODEC[:MIN_HEIGHT], e.g. 'av01:1080'"
+                raise click.BadParameter(msg, param_hint="--share")
+            min_height = int(height or 0)
+            report_share( codec_share( columns, codec, min_height ), codec, min_height )
+        return
+
+    if cache and all_languages:
+        Trace.warning( "cache: only for the summary report, not used with -A" )
+
+    if (workers > 1 or cache) and not all_languages:
+        results_cache = AnalysisCache.open( path, use_hash ) if cache else None
+        report_results( analyse_json_parallel( path, language, workers, cache=results_cache ) )
+        return
+
+    if not all_languages:
+        analyse_json_all( path, language=language )
+        return
+
+    results = analyse_languages_all( path )
+    if output:
+        export_json( Path(output).parent, Path(output).name, results )
+    else:
+        report_languages( results )
 
 if __name__ == "__main__":
     Trace.set(debug_mode=True, timezone=False)
     Trace.action(f"Python version {sys.version}")
+
+    Prefs.init("settings")
+    Prefs.load("settings.yaml")
+
     main()
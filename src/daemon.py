@@ -0,0 +1,61 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 18:20
+
+    src/daemon.py
+
+    uv run src/daemon.py
+    uv run src/daemon.py -p 8765 -w 4
+
+    curl -X POST localhost:8765/jobs -d '{"youtube_id": "rU5mxh5tsI0"}'
+    curl -X POST localhost:8765/jobs -d '{"youtube_id": "zqgbJq3T8Qo", "audio": true}'
+    curl localhost:8765/jobs/<job_id>
+    curl localhost:8765/jobs
+    curl localhost:8765/status
+
+    uv run src/daemon.py --host 0.0.0.0 --token <secret>     # other hosts: token required
+    curl -H "Authorization: Bearer <secret>" <host>:8765/status
+"""
+from __future__ import annotations
+
+import sys
+
+import click
+
+# helper
+from src.helper.daemon import Daemon, serve
+
+# utils
+from src.utils.globals import BASE_PATH
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+DEST_VIDEO = BASE_PATH / "data" / "video"
+DEST_AUDIO = BASE_PATH / "data" / "audio"
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="listen address (default: localhost only, other addresses need --token)")
+@click.option("--token", default="", envvar="YT_DAEMON_TOKEN", help="required 'Authorization: Bearer <token>' (env YT_DAEMON_TOKEN)")
+@click.option("-p",  "--port", type=click.IntRange(1, 65535), default=8765, help="listen port")
+@click.option("-w",  "--workers", type=click.IntRange(1, 32), default=2, help="parallel downloads")
+@click.option("-m",  "--metadata_workers", type=click.IntRange(1, 32), default=2, help="parallel metadata requests")
+@click.option("--host_limit", type=click.IntRange(1, 32), default=2, help="parallel downloads per googlevideo edge host")
+@click.option("--adaptive", is_flag=True, help="adaptive concurrency (AIMD): -w / -m are the maximum")
+@click.option("-d",  "--debug", is_flag=True, help="debug: show web traffic")
+
+def main(host: str, token: str, port: int, workers: int, metadata_workers: int, *, host_limit: int, adaptive: bool, debug: bool) -> None:
+    daemon = Daemon(DEST_VIDEO, DEST_AUDIO, debug, metadata_workers=metadata_workers, transfer_workers=workers, host_limit=host_limit, adaptive=adaptive)
+    serve(daemon, host, port, token)
+
+if __name__ == "__main__":
+    Trace.set(debug_mode=True, show_caller=False, timezone=False)
+    Trace.action(f"Python version {sys.version}")
+
+    Prefs.init("settings")
+    Prefs.load("settings.yaml")
+
+    try:
+        main()
+    except KeyboardInterrupt:
+        print()
+        Trace.exception("KeyboardInterrupt")
+        sys.exit()
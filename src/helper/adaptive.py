@@ -0,0 +1,176 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 20:40
+
+    src/helper/adaptive.py
+
+    adaptive concurrency (AIMD) for the scheduler (batch, daemon, worker: --adaptive)
+     - additive increase:       +1 download when the aggregate throughput of the last round improved
+                                +1 metadata request after a round without throttling
+     - multiplicative decrease: limit / 2 on throttling signals (HTTP 403/429, "Sign in to confirm"),
+                                no increase during the cooldown
+     - round: as many finished jobs as the current limit
+     - AdaptiveLimit without controller: fixed limit with priority order (size-aware scheduling)
+     - all decisions -> Trace
+
+    PUBLIC:
+    class AdaptiveLimit:
+      - AdaptiveLimit(name: str, maximum: int, minimum: int = 1, start: int = 1)
+      - async with AdaptiveLimit: ...
+      - await AdaptiveLimit.acquire(priority: float = 0.0) -> None
+      - AdaptiveLimit.release() -> None
+      - await AdaptiveLimit.increase(reason: str) -> None
+      - await AdaptiveLimit.decrease(reason: str) -> None
+
+    class Controller:
+      - Controller(metadata: AdaptiveLimit, transfer: AdaptiveLimit)
+      - await Controller.metadata_done(job: Job, ok: bool) -> None
+      - await Controller.transfer_done(job: Job, ok: bool, size: int, duration: float) -> None
+      - Controller.new_round() -> None
+
+     - is_throttled(error: str) -> bool
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import re
+import time
+
+from typing import TYPE_CHECKING, List, Tuple
+
+# utils
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    from src.helper.job import Job
+
+THROTTLE_PATTERN = re.compile(r"HTTP Error 403|HTTP Error 429|Too Many Requests|Sign in to confirm", re.IGNORECASE)
+
+IMPROVEMENT = 1.05 # throughput of a round must be 5 % better than the best one -> +1
+COOLDOWN    = 60   # sec after a decrease without increase
+
+def is_throttled(error: str) -> bool:
+    return THROTTLE_PATTERN.search(error) is not None
+
+class AdaptiveLimit:
+    def __init__(self, name: str, maximum: int, minimum: int = 1, start: int = 1) -> None:
+        self.name    = name
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.limit   = max(self.minimum, min(start, self.maximum))
+        self.active  = 0
+
+        self.cooldown_until = 0.0
+
+        self._waiters: List[Tuple[float, int, asyncio.Future[None]]] = [] # heap: priority, arrival
+        self._arrival = 0
+
+    async def __aenter__(self) -> None:
+        await self.acquire()
+
+    async def __aexit__(self, exc_type: type[BaseException] | None, exc: BaseException | None, tb: TracebackType | None) -> None:
+        self.release()
+
+    # lowest priority first, same priority -> arrival order
+
+    async def acquire(self, priority: float = 0.0) -> None:
+        if self.active < self.limit and len(self._waiters) == 0:
+            self.active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._arrival += 1
+        heapq.heappush(self._waiters, (priority, self._arrival, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release() # slot was granted at the same time
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters and self.active < self.limit:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.active += 1
+                future.set_result(None)
+
+    async def increase(self, reason: str) -> None:
+        if self.limit >= self.maximum or time.time() < self.cooldown_until:
+            return
+
+        self.limit += 1
+        self._wake()
+
+        Trace.info(f"adaptive {self.name}: {self.limit - 1} -> {self.limit} ({reason})")
+
+    async def decrease(self, reason: str) -> None:
+        self.cooldown_until = time.time() + COOLDOWN
+
+        if self.limit <= self.minimum:
+            Trace.warning(f"adaptive {self.name}: {self.limit} (minimum) - {reason}")
+            return
+
+        old = self.limit
+        self.limit = max(self.minimum, self.limit // 2) # running jobs finish, no new ones above the limit
+        Trace.warning(f"adaptive {self.name}: {old} -> {self.limit} ({reason})")
+
+class Controller:
+    def __init__(self, metadata: AdaptiveLimit, transfer: AdaptiveLimit) -> None:
+        self.metadata = metadata
+        self.transfer = transfer
+
+        self.metadata_round = 0
+
+        self.round_start = time.time()
+        self.round_jobs  = 0
+        self.round_bytes = 0
+        self.best_rate   = 0.0
+
+    async def metadata_done(self, job: Job, ok: bool) -> None:
+        if not ok and is_throttled(job.error):
+            self.metadata_round = 0
+            await self.metadata.decrease(f"throttled: {job.youtube_id}")
+            await self.transfer.decrease(f"throttled: {job.youtube_id}") # same client ip
+            return
+
+        self.metadata_round += 1
+        if self.metadata_round >= self.metadata.limit:
+            self.metadata_round = 0
+            await self.metadata.increase("round without throttling")
+
+    async def transfer_done(self, job: Job, ok: bool, size: int, duration: float) -> None:
+        if not ok and is_throttled(job.error):
+            self.new_round()
+            self.best_rate = 0.0 # new situation -> measure again
+            await self.transfer.decrease(f"throttled: {job.youtube_id}")
+            return
+
+        self.round_jobs  += 1
+        self.round_bytes += size
+        if self.round_jobs < self.transfer.limit:
+            return
+
+        if time.time() < self.transfer.cooldown_until: # rounds after a decrease are not the new reference
+            self.new_round()
+            return
+
+        rate = self.round_bytes / max(time.time() - self.round_start, 0.001)
+        Trace.info(f"adaptive transfer: round {self.round_jobs} job(s) - {rate / 1024 / 1024:.2f} MB/sec (best {self.best_rate / 1024 / 1024:.2f} MB/sec) - last {size / max(duration, 0.001) / 1024 / 1024:.2f} MB/sec")
+
+        if rate > self.best_rate * IMPROVEMENT:
+            self.best_rate = rate
+            await self.transfer.increase(f"{rate / 1024 / 1024:.2f} MB/sec")
+
+        self.new_round()
+
+    def new_round(self) -> None:
+        self.round_start = time.time()
+        self.round_jobs  = 0
+        self.round_bytes = 0
@@ -7,8 +7,13 @@
     - analyse_json_all( path: Path ) -> None
     - analyse_json( path: Path, filename: str ) -> None
 
-    - analyse_data( data: Dict[str, Any], name: str = "") -> Dict[str, Any]
+    info json: only the fields of INFO_FIELDS are decoded (src/utils/json_fields.py)
+
+    - analyse_data( data: Dict[str, Any], name: str = "") -> Dict[str, Any] # select_tracks + report_tracks
+
+    - select_tracks( data: Dict[str, Any], fource_language: str = "", details: bool = True ) -> Dict[str, Any] # no I/O
         {
+            'id': 'HS6dS2wmYfo',
             'language': 'de',
             'video': {
                 'vp09': ['303', 9],
@@ -18,8 +23,35 @@
             'audio': {
                 'opus': ['251-5', 3],
                 'mp4a': ['140-5', 3],
-            }
+            },
+            'languages_skipped': ['en-US'],
+            'original_language': 'de',
+            'protocols_skipped': {'m3u8_native': 13}, # skipped (no https)
+            'protocols_unknown': [],
+            'tracks': {'video': {...}, 'audio': {...}}, # all tracks per codec (details=True)
         }
+    - select_details( data: Dict[str, Any], video_rows: List[Dict[str, Any]], audio_rows: Dict[str, List[Dict[str, Any]]], min_pref: float ) -> Dict[str, Any] # tracks (details=True)
+    - select_batch( infos: Iterable[Dict[str, Any]], fource_language: str = "" ) -> List[Dict[str, Any]]  # no I/O
+    - report_tracks( result: Dict[str, Any], name: str = "", fource_language: str = "" ) -> None
+
+    parallel (process pool, chunks of files, results in file order), optional cache of the results (src/helper/analysis_cache.py):
+    - analyse_json_parallel( path: Path, language: str, workers: int, chunk_size: int = 0, cache: AnalysisCache | None = None ) -> List[Dict[str, Any]]
+    - report_results( results: List[Dict[str, Any]] ) -> None # one line per file + summary
+
+    all languages in one pass (each file is read once):
+    - analyse_languages_all( path: Path ) -> List[Dict[str, Any]]
+    - select_languages( data: Dict[str, Any] ) -> Dict[str, Any] # no I/O
+        {
+            'id': 'HS6dS2wmYfo',
+            'original_language': 'de-DE',
+            'default_language': 'de-DE',   # highest 'language_preference'
+            'video': {'avc1': ['299', 9], 'vp9': ['315', 11]},
+            'languages': {
+                'de-DE': {'opus': ['251-1', 3], 'mp4a': ['140-1', 3]},
+                'en-US': {'opus': ['251-0', 3], 'mp4a': ['140-0', 3]},
+            },
+        }
+    - report_languages( results: List[Dict[str, Any]] ) -> None
 
     video:
      - vp09 [248], [625]
@@ -45,122 +77,303 @@
     quality audio:
      - 2: ~  64 kbit/sec
      - 3: ~ 128 kbit/sec
+
+    best per codec: format policy of settings.yaml ('format.normal', 'format.audio_only', 'format.policy')
+     -> every available codec is reported, codecs which are not in the lists are ranked last
+     -> formats outside the constraints (max_height, max_fps, dynamic_range, drc) are skipped
 """
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# helper
+from src.helper.info_json import SIDECAR_EXTENSIONS
+from src.helper.selection import analyse_policy, format_table
 
 # utils
-from src.utils.file import import_json, listdir_match_extention
+from src.utils.file import listdir_match_extention
+from src.utils.json_fields import import_json_fields
+from src.utils.prefs import Prefs
 from src.utils.trace import Trace
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from pathlib import Path
 
+    from src.helper.analysis_cache import AnalysisCache
+
+REPORT_KEYS = ("language", "video", "audio", "languages_skipped")
+
+MAX_CHUNK = 64 # files per task (parallel)
+
+# fields of the info json used by the selection (select_tracks, select_languages) - everything else is skipped
+
+FORMAT_FIELDS = dict.fromkeys((
+    "format_id", "format_note", "protocol", "acodec", "vcodec", "language", "language_preference",
+    "quality", "tbr", "width", "height", "fps", "dynamic_range", "audio_channels", "asr",
+    "filesize", "filesize_approx",
+), True)
+
+INFO_FIELDS = {
+    "id":       True,
+    "title":    True,
+    "duration": True,
+    "formats":  [FORMAT_FIELDS],
+}
+
 # yt-dlp https://www.youtube.com/watch?v=37SpumiGHgE --list-formats
 
 def analyse_json_all(path: Path, language: str) -> None:
-    files, _ = listdir_match_extention( path, ["json"] )
+    files, _ = listdir_match_extention( path, SIDECAR_EXTENSIONS )
     for file in files:
         analyse_json( path, file, language )
 
 def analyse_json(path: Path, filename: str, language: str) -> None:
-    data = import_json( path, filename )
+    data = import_json_fields( path, filename, INFO_FIELDS )
     if data is None:
         return
 
     _result = analyse_data( data, filename, language )
 
-def analyse_data(data: Dict[str, Any], name: str = "", fource_language: str = "") -> Dict[str, Any]:
+# process pool: every worker gets the settings of the main process (spawn), one task = chunk of files
+#  -> no Trace per file in the workers, results in the order of the files
 
-    if fource_language != "":
-        Trace.info( f"force language '{fource_language}'" )
+def analyse_json_parallel(path: Path, language: str, workers: int, chunk_size: int = 0, cache: AnalysisCache | None = None) -> List[Dict[str, Any]]:
+    files, _ = listdir_match_extention( path, SIDECAR_EXTENSIONS )
+    if len(files) == 0:
+        return []
 
-    videos: Dict[str, Any] = {}            # avc1, vp09, av01
-    audios: Dict[str, Dict[str, Any]] = {} # mp4a, opus, ac-3, ec-3 (per language)
+    # cache: unchanged files -> stored result, only new or modified files are analysed
 
-    original_language = None
+    results: List[Dict[str, Any] | None] = [None] * len(files)
+    if cache is not None:
+        for i, file in enumerate(files):
+            results[i] = cache.get(file, language)
 
-    video_id = data["id"]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if cache is not None:
+        Trace.info( f"cache: {len(files) - len(missing)} of {len(files)} file(s) unchanged" )
 
-    if name == "":
-        Trace.info(f"{video_id}'")
-    else:
-        Trace.info(f"{video_id} - '{name}'")
+    if len(missing) > 0:
+        workers = max(1, min(workers, len(missing)))
+        select = partial(select_file, path, language=language)
 
-    formats = data["formats"]
+        if workers == 1:
+            selected = [select(files[i]) for i in missing]
+        else:
+            if chunk_size <= 0:
+                chunk_size = max(1, min(MAX_CHUNK, len(missing) // (workers * 4))) # ~ 4 tasks per worker
 
-    # pass 1: get max. 'language_preference' == original language (?)
+            Trace.info( f"{len(missing)} file(s) - {workers} process(es) - {chunk_size} file(s) per task" )
 
-    max_language_pref = -1
-    for format in formats:
-        protokoll = format["protocol"]
-        if protokoll != "https":
-            continue
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=init_worker, initargs=(Prefs.get_all(), dict(Trace.settings))) as executor:
+                selected = list(executor.map(select, [files[i] for i in missing], chunksize=chunk_size))
 
-        max_language_pref = max(max_language_pref, format.get("language_preference", -1))
+        for i, result in zip(missing, selected, strict=True):
+            results[i] = result
+            if cache is not None and "error" not in result:
+                cache.put(files[i], language, result)
 
-    # pass 2: find the highest data rate for each codec
+    if cache is not None:
+        cache.prune(files)
 
-    languages_skipped = set()
-    for format in formats:
-        id = format["format_id"]
+    return [result for result in results if result is not None]
 
-        acodec = format.get("acodec", "none")
-        vcodec = format.get("vcodec", "none")
+def init_worker(prefs: Dict[str, Any], trace: Dict[str, Any]) -> None:
+    Prefs.data = prefs
+    Trace.set(**trace)
 
-        if acodec == "none" and vcodec == "none":
-            continue
+def select_file(path: Path, filename: str, language: str) -> Dict[str, Any]:
+    data = import_json_fields( path, filename, INFO_FIELDS, show_error=False )
+    if data is None:
+        return {"file": filename, "error": "not readable"}
+
+    try:
+        result = select_tracks( data, language, details=False )
+    except (KeyError, TypeError, ValueError) as err:
+        return {"file": filename, "error": f"{type(err).__name__}: {err}"}
+
+    del result["tracks"]
+    result["file"] = filename
+    return result
+
+# one line per file (order of the files) + summary: codecs, chosen ids, skipped languages
+
+def report_results(results: List[Dict[str, Any]]) -> None:
+    videos:  Dict[str, Dict[str, int]] = {}
+    audios:  Dict[str, Dict[str, int]] = {}
+    skipped: Dict[str, int] = {}
+    failed = []
 
-        protokoll = format["protocol"]
-        if protokoll in {"mhtml", "m3u8_native", "http_dash_segments"}:
-            Trace.info(f"skip '{protokoll}'")
+    for result in results:
+        if "error" in result:
+            failed.append(result)
             continue
 
-        if protokoll != "https":
-            Trace.error(f"unknown protokoll '{protokoll}' - expected 'https'")
+        Trace.result( f"{result['id']} [{result['language']}] video: {result['video']} - audio: {result['audio']} - '{result['file']}'" )
+
+        for summary, key in ((videos, "video"), (audios, "audio")):
+            for codec, (id, _quality) in result[key].items():
+                ids = summary.setdefault(codec, {})
+                ids[id] = ids.get(id, 0) + 1
+
+        for language in result["languages_skipped"]:
+            skipped[language] = skipped.get(language, 0) + 1
+
+    done = len(results) - len(failed)
+    Trace.result( f"summary: {done} file(s), {len(failed)} failed" )
+
+    for kind, summary in (("video", videos), ("audio", audios)):
+        for codec, ids in sorted(summary.items(), key=lambda item: -sum(item[1].values())):
+            chosen = ", ".join(f"{id} {count}x" for id, count in sorted(ids.items(), key=lambda item: -item[1]))
+            Trace.result( f"  {kind} {codec:5} {sum(ids.values()):5} / {done} - {chosen}" )
+
+    if skipped:
+        Trace.result( f"  languages skipped: {', '.join(f'{language} {count}x' for language, count in sorted(skipped.items()))}" )
+
+    for result in failed:
+        Trace.error( f"failed: '{result['file']}' - {result['error']}" )
+
+# all languages: one import per file -> list of results (see select_languages)
+
+def analyse_languages_all(path: Path) -> List[Dict[str, Any]]:
+    results = []
+
+    files, _ = listdir_match_extention( path, SIDECAR_EXTENSIONS )
+    for file in files:
+        data = import_json_fields( path, file, INFO_FIELDS )
+        if data is None:
             continue
 
-        # Audio + Video -> low quality
+        result = select_languages( data )
+        result["file"] = file
+        results.append( result )
+
+    return results
+
+def analyse_data(data: Dict[str, Any], name: str = "", fource_language: str = "") -> Dict[str, Any]:
+    result = select_tracks( data, fource_language )
+    report_tracks( result, name, fource_language )
+    return result
+
+# many info dicts (tight loops, worker processes) -> one policy, no per-format tracks
+
+def select_batch(infos: Iterable[Dict[str, Any]], fource_language: str = "") -> List[Dict[str, Any]]:
+    return [select_tracks( info, fource_language, details=False ) for info in infos]
+
+# selection only - no Trace, no file access (the policy is compiled once)
+#  - one walk over the formats (format table), then per language / per codec
+#  - audio: tracks below the max. 'language_preference' (original language ?) or of another forced language are skipped
+
+PROTOCOLS_SKIPPED = ("mhtml", "m3u8_native", "http_dash_segments")
 
-        if acodec != "none" and vcodec != "none":
+NO_TRACK = float("-inf")
+
+def select_tracks(data: Dict[str, Any], fource_language: str = "", details: bool = True) -> Dict[str, Any]:
+    policy = analyse_policy()
+
+    protocols: Dict[str, int] = {}
+    rows = format_table(data, protocols)
+
+    video_rows = []
+    audio_rows: Dict[str, List[Dict[str, Any]]] = {} # language -> rows
+    languages:  Dict[str, List[float]] = {}          # language -> [min. pref, max. pref (no DRC), max. pref original (no DRC)]
+    max_language_pref = -1
+
+    for row in rows:
+        pref = row["language_pref"]
+        max_language_pref = max(max_language_pref, pref)
+
+        if row["kind"] == "video":
+            video_rows.append(row)
             continue
 
-        # Audio
+        language = row["language"]
+        audio_rows.setdefault(language, []).append(row)
 
-        if acodec != "none":
-            type = acodec.split(".")[0]
-            if format.get("language"):
-                lang = format["language"]
-            else:
-                lang = "null"
+        prefs = languages.setdefault(language, [pref, NO_TRACK, NO_TRACK])
+        prefs[0] = min(prefs[0], pref)
+        if not row["drc"]:
+            prefs[1] = max(prefs[1], pref)
+            if row["original"]:
+                prefs[2] = max(prefs[2], pref)
 
-            lang_pref = format.get("language_preference", -1)
+    min_pref = NO_TRACK if fource_language != "" else max_language_pref # forced language: 'language_preference' not used
 
-            if fource_language != "":
-                if lang.split("-")[0] != fource_language:
-                    languages_skipped.add(lang)
-                    continue
+    languages_skipped = []
+    languages_kept    = []
+    original_language = None
+    for language, (lowest_pref, best_pref, original_pref) in languages.items():
+        if fource_language != "" and language.split("-")[0] != fource_language:
+            languages_skipped.append(language)
+            continue
 
-            elif max_language_pref > lang_pref:
-                languages_skipped.add(lang)
-                continue
+        if lowest_pref < min_pref:
+            languages_skipped.append(language)
+        if best_pref > NO_TRACK and best_pref >= min_pref:
+            languages_kept.append(language)
+            if original_pref > NO_TRACK and original_pref >= min_pref:
+                original_language = language
 
-            note = format.get("format_note", "" )  # "English (United States) original (default), medium",
-            if "DRC" in note:
-                continue
-            if "original" in note:
-                original_language = lang
+    language = fource_language
+    if len(languages_kept) == 1:
+        language = languages_kept[0]
+    elif original_language:
+        language = original_language
 
-            if lang not in audios:
-                audios[lang] = {}
+    # best per codec (format policy): video -> vp09, avc1, av01, audio -> opus, mp4a, ac-3, ec-3
 
-            if type not in audios[lang]:
-                audios[lang][type] = {}
+    video_best = {codec: [row["id"], round(row["quality"])] for codec, row in policy.best_per_codec(video_rows, "video").items()}
 
-            audios[lang][type][id] = {
-                "codec":    acodec,
-                "pref":     lang_pref,
+    audio_best = {}
+    if language in languages_kept:
+        audio_best = {codec: [row["id"], round(row["quality"])] for codec, row in policy.best_per_codec(audio_rows[language], "audio").items()}
+
+    return {
+        "id":                data["id"],
+        "language":          language,
+        "video":             video_best,
+        "audio":             audio_best,
+        "languages_skipped": languages_skipped,
+        "original_language": original_language,
+        "protocols_skipped": {protocol: count for protocol, count in protocols.items() if protocol in PROTOCOLS_SKIPPED},
+        "protocols_unknown": sorted(protocol for protocol in protocols if protocol not in PROTOCOLS_SKIPPED),
+        "tracks":            select_details(data, video_rows, {language: audio_rows[language] for language in languages_kept}, min_pref) if details else {"video": {}, "audio": {}},
+    }
+
+# all tracks per codec (report_tracks debug) - fields of the info json which are not in the format table
+
+def select_details(data: Dict[str, Any], video_rows: List[Dict[str, Any]], audio_rows: Dict[str, List[Dict[str, Any]]], min_pref: float) -> Dict[str, Any]:
+    formats = {format["format_id"]: format for format in data["formats"]}
+
+    videos: Dict[str, Dict[str, Any]] = {}
+    for row in video_rows:
+        format = formats[row["id"]]
+        videos.setdefault(row["codec"], {})[row["id"]] = {
+            "codec":    format["vcodec"],
+            "tbr":      round(format["tbr"]),
+            "quality":  round(format["quality"]),
+            "width":    format["width"],
+            "height":   format["height"],
+            "fps":      round(format["fps"]),
+            "filesize": format.get("filesize"),
+        }
+
+    audios: Dict[str, Dict[str, Any]] = {}
+    for language, rows in audio_rows.items():
+        for row in rows:
+            if row["drc"] or row["language_pref"] < min_pref:
+                continue
+
+            format = formats[row["id"]]
+            audios.setdefault(language, {}).setdefault(row["codec"], {})[row["id"]] = {
+                "codec":    format["acodec"],
+                "pref":     format.get("language_preference", -1),
                 "tbr":      round(format["tbr"]),
                 "quality":  round(format["quality"]),
                 "channels": format.get("audio_channels", 0),
@@ -168,73 +381,95 @@ def analyse_data(data: Dict[str, Any], name: str = "", fource_language: str = ""
                 "filesize": format.get("filesize"),
             }
 
-        # Video
+    return {"video": videos, "audio": audios}
 
-        if vcodec != "none":
-            type = vcodec.split(".")[0]
+# report of a selection -> Trace (debug: all tracks)
 
-            if type not in videos:
-                videos[type] = {}
+def report_tracks(result: Dict[str, Any], name: str = "", fource_language: str = "") -> None:
+    if fource_language != "":
+        Trace.info( f"force language '{fource_language}'" )
 
-            videos[type][id] = {
-                "codec":    vcodec,
-                "tbr":      round(format["tbr"]),
-                "quality":  round(format["quality"]),
-                "width":    format["width"],
-                "height":   format["height"],
-                "fps":      round(format["fps"]),
-                "filesize": format.get("filesize"),
-            }
+    if name == "":
+        Trace.info(f"{result['id']}'")
+    else:
+        Trace.info(f"{result['id']} - '{name}'")
+
+    for protokoll, count in result["protocols_skipped"].items():
+        Trace.info(f"skip '{protokoll}' ({count}x)")
+
+    for protokoll in result["protocols_unknown"]:
+        Trace.error(f"unknown protokoll '{protokoll}' - expected 'https'")
 
     # all available video tracks
 
-    for key, value in videos.items():
+    for key, value in result["tracks"]["video"].items():
         Trace.debug()
         Trace.debug( f"video: {key}")
         for type, types in value.items():
             size = f"{types['width']}x{types['height']}"
             Trace.debug( f"id: {type:3} - quality: {types['quality']:2} - tbr: {types['tbr']:4} - size: {size:9} - codec: {types['codec']}")
 
-    # video type -> vp09, avc1, av01
-
-    video_best = {}
-    for type, value in videos.items(): # -> last entry
-        last    = list(value)[-1]
-        quality = value[last]["quality"]
-        video_best[type] = [last, quality]
-
     # all available audio tracks
 
-    for lang, data_lang in audios.items():
+    for lang, data_lang in result["tracks"]["audio"].items():
         for key, value in data_lang.items():
             Trace.debug()
             Trace.debug( f"audio: {lang} - {key}")
             for type, types in value.items():
                 Trace.debug( f"id: {type:3} - quality: {types['quality']:2} - tbr: {types['tbr']:4} - codec: {types['codec']} - pref: {types['pref']}")
 
-    language = fource_language
-    if len( audios ) == 1:
-        language = next(iter(audios.keys()))
-    elif original_language:
-        language = original_language
+    if len(result["audio"]) == 0:
+        Trace.error( f"language '{result['language']}' empty" )
 
-    # audio type -> opus, mp4a
+    Trace.result(f"{ {key: result[key] for key in REPORT_KEYS} }")
 
-    audio_best = {}
-    if language not in audios:
-        Trace.error( f"language '{language}' empty" )
-    else:
-        for type, value in audios[language].items(): # -> last entry
-            last    = list(value)[-1]
-            quality = audios[language][type][last]["quality"]
-            audio_best[type] = [last, quality]
-
-    result = {
-        "language": language,
-        "video": video_best,
-        "audio": audio_best,
-        "languages_skipped": list(languages_skipped),
+# best audio per codec for every language - one walk over the formats (format table), no I/O
+
+def select_languages(data: Dict[str, Any]) -> Dict[str, Any]:
+    policy = analyse_policy()
+    rows = format_table(data)
+
+    by_language: Dict[str, List[Dict[str, Any]]] = {}
+    original_language = None
+    default_language  = None
+    default_pref      = -2
+
+    for row in rows:
+        if row["kind"] != "audio":
+            continue
+
+        language = row["language"]
+        by_language.setdefault(language, []).append(row)
+
+        if row["original"] and not row["drc"]:
+            original_language = language
+        if row["language_pref"] > default_pref:
+            default_pref = row["language_pref"]
+            default_language = language
+
+    languages = {}
+    for language, language_rows in by_language.items():
+        best = policy.best_per_codec(language_rows, "audio")
+        languages[language] = {codec: [row["id"], round(row["quality"])] for codec, row in best.items()}
+
+    video = policy.best_per_codec(rows, "video")
+
+    return {
+        "id":                data["id"],
+        "original_language": original_language,
+        "default_language":  default_language,
+        "video":             {codec: [row["id"], round(row["quality"])] for codec, row in video.items()},
+        "languages":         languages,
     }
 
-    Trace.result(f"{result}")
-    return result
+# table: one line per file and language (* = original, + = default)
+
+def report_languages(results: List[Dict[str, Any]]) -> None:
+    for result in results:
+        video = ", ".join(f"{codec} {value[0]}" for codec, value in result["video"].items())
+        Trace.result(f"{result['id']} - video: {video or '-'} - '{result.get('file', '')}'")
+
+        for language, audio in result["languages"].items():
+            mark = ("*" if language == result["original_language"] else " ") + ("+" if language == result["default_language"] else " ")
+            codecs = ", ".join(f"{codec} {value[0]}" for codec, value in audio.items())
+            Trace.result(f"  {mark} {language:6} - audio: {codecs or '-'}")
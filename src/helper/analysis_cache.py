@@ -0,0 +1,150 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 23:50
+
+    src/helper/analysis_cache.py
+
+    persistent cache of the analyse results (SQLite) per folder -> <path>/analyse.sqlite
+     - key: file name, forced language
+     - valid: same size and mtime_ns, or (use_hash) same size and same content hash (e.g. file copied, touched)
+     - content hash (blake2b) only stored with use_hash -> rows of a run without it: new mtime = analysed again
+     - only the summary results (analyse_json_parallel, details=False): the detailed report per file
+       (analyse_json_all) and all languages (analyse_languages_all) are always analysed
+     - version: format settings (codecs of both modes, policy) + ANALYSE_VERSION -> other settings = other results
+
+    PUBLIC:
+    class AnalysisCache:
+      - AnalysisCache.open(path: Path | str, use_hash: bool = False) -> AnalysisCache
+      - AnalysisCache.get(filename: str, language: str) -> Dict[str, Any] | None
+      - AnalysisCache.put(filename: str, language: str, result: Dict[str, Any]) -> None
+      - AnalysisCache.prune(filenames: Iterable[str]) -> int
+
+     - settings_version() -> str
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Tuple
+
+# utils
+from src.utils.prefs import Prefs
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+CACHE_NAME = "analyse.sqlite"
+
+ANALYSE_VERSION = 2 # +1 on changes of the selection code
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    filename TEXT NOT NULL,
+    language TEXT NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    hash     TEXT NOT NULL,
+    version  TEXT NOT NULL,
+    result   TEXT NOT NULL,
+    PRIMARY KEY (filename, language)
+);
+"""
+
+def settings_version() -> str:
+    settings = {
+        "analyse":    ANALYSE_VERSION,
+        "normal":     Prefs.get("format.normal", {}),
+        "audio_only": Prefs.get("format.audio_only", {}),
+        "policy":     Prefs.get("format.policy", {}),
+    }
+    return hashlib.sha1(json.dumps(settings, sort_keys=True).encode("utf-8")).hexdigest()[:16]  # noqa: S324
+
+class AnalysisCache:
+    instances: ClassVar[Dict[Tuple[Path, bool], AnalysisCache]] = {}
+    instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path, use_hash: bool) -> None:
+        self.path = path
+        self.use_hash = use_hash
+        self.version = settings_version()
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path / CACHE_NAME, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL") # cache: losing the last results is harmless
+            self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: Path | str, use_hash: bool = False) -> AnalysisCache:
+        path = Path(path).resolve()
+        with cls.instances_lock:
+            if (path, use_hash) not in cls.instances:
+                cls.instances[(path, use_hash)] = AnalysisCache(path, use_hash)
+            return cls.instances[(path, use_hash)]
+
+    def get(self, filename: str, language: str) -> Dict[str, Any] | None:
+        try:
+            stat = (self.path / filename).stat()
+        except OSError:
+            return None
+
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT * FROM results WHERE filename = ? AND language = ? AND version = ?",
+                (filename, language, self.version),
+            ).fetchone()
+
+        if row is None or row["size"] != stat.st_size:
+            return None
+
+        if row["mtime_ns"] != stat.st_mtime_ns:
+            if not self.use_hash or row["hash"] == "" or row["hash"] != self._hash(filename):
+                return None
+
+            with self.lock, self.connection: # same content -> new mtime
+                self.connection.execute(
+                    "UPDATE results SET mtime_ns = ? WHERE filename = ? AND language = ?",
+                    (stat.st_mtime_ns, filename, language),
+                )
+
+        return json.loads(row["result"])
+
+    def put(self, filename: str, language: str, result: Dict[str, Any]) -> None:
+        try:
+            stat = (self.path / filename).stat()
+        except OSError:
+            return
+
+        content_hash = self._hash(filename) if self.use_hash else "" # reading the whole file -> only when used
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (filename, language, size, mtime_ns, hash, version, result) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (filename, language, stat.st_size, stat.st_mtime_ns, content_hash, self.version, json.dumps(result, ensure_ascii=False)),
+            )
+
+    # results of deleted files -> removed (number of rows)
+
+    def prune(self, filenames: Iterable[str]) -> int:
+        existing = set(filenames)
+
+        with self.lock:
+            stored = {row["filename"] for row in self.connection.execute("SELECT DISTINCT filename FROM results")}
+
+            with self.connection:
+                count = 0
+                for filename in stored - existing:
+                    count += self.connection.execute("DELETE FROM results WHERE filename = ?", (filename,)).rowcount
+        return count
+
+    def _hash(self, filename: str) -> str:
+        try:
+            with (self.path / filename).open("rb") as f:
+                return hashlib.file_digest(f, "blake2b").hexdigest()
+        except OSError:
+            return ""
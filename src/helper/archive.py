@@ -0,0 +1,144 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 12:40
+
+    src/helper/archive.py
+
+    download archive (SQLite) per destination folder -> <path>/archive.sqlite
+     - downloads:  youtube_id (primary key), channel, title, format, filepath, size, timestamp
+     - info_jsons: youtube_id (primary key), filepath -> info json sidecar
+     - channels:   url (primary key), newest_id, newest_timestamp, last_sync -> incremental sync
+     - shared (worker mode, network filesystem): no WAL -> settings.yaml 'queue.shared' (same as the job queue)
+
+    PUBLIC:
+    class Archive:
+      - Archive.open(path: Path | str, shared: bool | None = None) -> Archive
+      - Archive.get(youtube_id: str) -> Dict[str, Any] | None
+      - Archive.add(youtube_id: str, channel: str, title: str, format: str, filepath: Path | str) -> None
+      - Archive.remove(youtube_id: str) -> None
+      - Archive.get_info_json(youtube_id: str) -> str | None
+      - Archive.set_info_json(youtube_id: str, filepath: Path | str) -> None
+      - Archive.get_channel(url: str) -> Dict[str, Any] | None
+      - Archive.set_channel(url: str, newest_id: str, newest_timestamp: float) -> None
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import Any, ClassVar, Dict
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+ARCHIVE_NAME = "archive.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS downloads (
+    youtube_id TEXT PRIMARY KEY,
+    channel    TEXT NOT NULL,
+    title      TEXT NOT NULL,
+    format     TEXT NOT NULL,
+    filepath   TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    timestamp  REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS info_jsons (
+    youtube_id TEXT PRIMARY KEY,
+    filepath   TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS channels (
+    url              TEXT PRIMARY KEY,
+    newest_id        TEXT NOT NULL,
+    newest_timestamp REAL NOT NULL,
+    last_sync        REAL NOT NULL
+);
+"""
+
+class Archive:
+    instances: ClassVar[Dict[Path, Archive]] = {}
+    instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path, shared: bool) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.filepath = path / ARCHIVE_NAME
+        self.lock = threading.Lock()
+
+        # shared archive (network filesystem, several hosts): no WAL (needs shared memory of one host)
+
+        self.shared = shared
+
+        # one connection for all worker threads -> access is serialized by self.lock
+
+        self.connection = sqlite3.connect(self.filepath, timeout=60, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=DELETE" if self.shared else "PRAGMA journal_mode=WAL")
+            self.connection.executescript(SCHEMA)
+
+    @classmethod
+    def open(cls, path: Path | str, shared: bool | None = None) -> Archive:
+        if shared is None:
+            shared = bool(Prefs.get("queue.shared", False))
+
+        path = Path(path).resolve()
+        with cls.instances_lock:
+            if path not in cls.instances:
+                cls.instances[path] = Archive(path, shared)
+            return cls.instances[path]
+
+    def get(self, youtube_id: str) -> Dict[str, Any] | None:
+        with self.lock:
+            row = self.connection.execute("SELECT * FROM downloads WHERE youtube_id = ?", (youtube_id,)).fetchone()
+
+        if row is None:
+            return None
+        return dict(row)
+
+    def add(self, youtube_id: str, channel: str, title: str, format: str, filepath: Path | str) -> None:
+        filepath = Path(filepath)
+
+        try:
+            size = filepath.stat().st_size
+        except OSError as e:
+            Trace.error(f"archive: {e}")
+            return
+
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO downloads VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (youtube_id, channel, title, format, str(filepath), size, time.time()),
+            )
+
+    def remove(self, youtube_id: str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM downloads WHERE youtube_id = ?", (youtube_id,))
+
+    def get_info_json(self, youtube_id: str) -> str | None:
+        with self.lock:
+            row = self.connection.execute("SELECT filepath FROM info_jsons WHERE youtube_id = ?", (youtube_id,)).fetchone()
+
+        if row is None:
+            return None
+        return str(row["filepath"])
+
+    def set_info_json(self, youtube_id: str, filepath: Path | str) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO info_jsons VALUES (?, ?)", (youtube_id, str(filepath)))
+
+    def get_channel(self, url: str) -> Dict[str, Any] | None:
+        with self.lock:
+            row = self.connection.execute("SELECT * FROM channels WHERE url = ?", (url,)).fetchone()
+
+        if row is None:
+            return None
+        return dict(row)
+
+    def set_channel(self, url: str, newest_id: str, newest_timestamp: float) -> None:
+        with self.lock, self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO channels VALUES (?, ?, ?, ?)", (url, newest_id, newest_timestamp, time.time()))
@@ -0,0 +1,208 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 16:00
+
+    src/helper/bandwidth.py
+
+    global token bucket for all downloads of the process (optional: of all processes)
+     - rate by time of day -> settings.yaml 'bandwidth.limits'
+     - optional shared state file -> settings.yaml 'bandwidth.shared_file'
+       -> booked in batches (SHARED_BATCH sec of the rate), the blocks of a batch are taken from a local allowance (no file access)
+     - bytes beyond the budget are booked as debt -> the caller sleeps until it is paid,
+       total throughput stays at the limit instead of oscillating
+
+    PUBLIC:
+    static class Bandwidth:
+      - Bandwidth.init(limits: List[Dict[str, Any]] | None = None, shared_file: Path | str | None = None) -> None
+      - Bandwidth.consume(size: int) -> None
+      - Bandwidth.current_rate(now: datetime | None = None) -> float
+
+     - parse_rate(value: float | str) -> float
+     - parse_size(value: float | str) -> int
+
+    PRIVATE:
+     - parse_time(value: str) -> int
+     - take_tokens(state: Dict[str, float], size: int, rate: float, now: float) -> float
+     - locked_file(filepath: Path) -> Generator[IO[str]]
+"""
+from __future__ import annotations
+
+import contextlib
+import platform
+import re
+import threading
+import time
+
+from datetime import datetime
+from typing import IO, TYPE_CHECKING, Any, ClassVar, Dict, Generator, List
+
+# utils
+from src.utils.globals import BASE_PATH
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+BURST = 1.0 # sec -> bucket capacity = rate * BURST
+
+SHARED_BATCH = 1.0 # sec of the rate booked at once in the shared file
+
+class Bandwidth:
+    initialized: bool = False
+    limits: ClassVar[List[Dict[str, Any]]] = []
+    shared_file: Path | None = None
+
+    state: ClassVar[Dict[str, float]] = {"tokens": 0.0, "timestamp": 0.0}
+    allowance: float = 0.0 # shared mode: bytes booked in the shared file, not yet consumed
+    lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def init(cls, limits: List[Dict[str, Any]] | None = None, shared_file: Path | str | None = None) -> None:
+        if limits is None:
+            limits = Prefs.get("bandwidth.limits", [])
+        if shared_file is None:
+            shared_file = Prefs.get("bandwidth.shared_file", "")
+
+        cls.limits = []
+        for limit in limits or []:
+            cls.limits.append({
+                "from": parse_time(str(limit["from"])),
+                "to":   parse_time(str(limit["to"])),
+                "rate": parse_rate(limit["rate"]),
+            })
+
+        cls.shared_file = BASE_PATH / shared_file if shared_file else None
+        cls.state = {"tokens": 0.0, "timestamp": 0.0}
+        cls.allowance = 0.0
+        cls.initialized = True
+
+    @classmethod
+    def current_rate(cls, now: datetime | None = None) -> float:
+        if now is None:
+            now = datetime.now().astimezone() # local time of day
+        minute = now.hour * 60 + now.minute
+
+        for limit in cls.limits:
+            if limit["from"] <= limit["to"]:
+                if limit["from"] <= minute < limit["to"]:
+                    return float(limit["rate"])
+
+            elif minute >= limit["from"] or minute < limit["to"]: # e.g. 22:00 - 06:00
+                return float(limit["rate"])
+
+        return 0.0
+
+    @classmethod
+    def consume(cls, size: int) -> None:
+        if size <= 0:
+            return
+
+        if not cls.initialized:
+            with cls.lock:
+                if not cls.initialized:
+                    cls.init()
+
+        rate = cls.current_rate()
+        if rate <= 0:
+            return # unlimited
+
+        if cls.shared_file is None:
+            with cls.lock:
+                wait = take_tokens(cls.state, size, rate, time.time())
+        else:
+            try:
+                with cls.lock:
+                    if cls.allowance >= size:
+                        cls.allowance -= size
+                        return
+
+                    # allowance used up -> next batch (at least this block) from the shared file
+
+                    batch = max(size - cls.allowance, rate * SHARED_BATCH)
+                    with locked_file(cls.shared_file) as f:
+                        f.seek(0)
+                        values = f.read().split()
+                        state = {"tokens": float(values[0]), "timestamp": float(values[1])} if len(values) == 2 else {"tokens": 0.0, "timestamp": 0.0}
+
+                        wait = take_tokens(state, int(batch), rate, time.time())
+
+                        f.seek(0)
+                        f.truncate()
+                        f.write(f"{state['tokens']:.1f} {state['timestamp']:.6f}")
+
+                    cls.allowance += int(batch) - size
+
+            except (OSError, ValueError) as e:
+                Trace.error(f"bandwidth shared file: {e} -> process limit only")
+                cls.shared_file = None
+                return
+
+        if wait > 0:
+            time.sleep(wait)
+
+# 5000000, "5M", "800K", "1.5M" -> bytes/sec
+
+def parse_rate(value: float | str) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)B?\s*", value.upper())
+    if match is None:
+        Trace.error(f"invalid value '{value}' (e.g. '800K', '5M') -> 0 (unlimited)")
+        return 0.0
+
+    factor = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}[match.group(2)]
+    return float(match.group(1)) * factor
+
+# 1073741824, "1G", "500M" -> bytes (same units as the rates)
+
+def parse_size(value: float | str) -> int:
+    return int(parse_rate(value))
+
+# "07:30" -> 450 (minute of the day), "24:00" -> 1440
+
+def parse_time(value: str) -> int:
+    hours, minutes = value.split(":")
+    return int(hours) * 60 + int(minutes)
+
+# refill, book 'size' (tokens may become negative = debt) -> seconds until the debt is paid
+
+def take_tokens(state: Dict[str, float], size: int, rate: float, now: float) -> float:
+    capacity = rate * BURST
+
+    if state["timestamp"] == 0:
+        state["tokens"] = capacity
+    else:
+        state["tokens"] = min(capacity, state["tokens"] + (now - state["timestamp"]) * rate)
+
+    state["timestamp"] = now
+    state["tokens"] -= size
+
+    if state["tokens"] >= 0:
+        return 0.0
+    return -state["tokens"] / rate
+
+@contextlib.contextmanager
+def locked_file(filepath: Path) -> Generator[IO[str]]:
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.touch(exist_ok=True)
+
+    with filepath.open(mode="r+", encoding="utf-8") as f:
+        if platform.system() == "Windows":
+            import msvcrt  # noqa: PLC0415
+
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)      # type: ignore[attr-defined, reportAttributeAccessIssue] # -> Linux
+            try:
+                yield f
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1) # type: ignore[attr-defined, reportAttributeAccessIssue] # -> Linux
+
+        else:
+            import fcntl  # noqa: PLC0415
+
+            fcntl.flock(f, fcntl.LOCK_EX)                      # type: ignore[attr-defined, reportAttributeAccessIssue] # -> Windows
+            try:
+                yield f
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)                  # type: ignore[attr-defined, reportAttributeAccessIssue] # -> Windows
@@ -0,0 +1,109 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 12:05
+
+    src/helper/batch.py
+
+    PUBLIC:
+     - read_ids(lines: Iterable[str]) -> List[str]
+     - run_batch(youtube_ids: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, resume: bool = False, adaptive: bool = False) -> List[Job]
+     - report_batch(jobs: List[Job]) -> None
+
+    PRIVATE:
+     - report_job(job: Job) -> None
+     - format_bytes(size: float) -> str
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Generator, List
+
+# helper
+from src.helper.job import Job
+from src.helper.jobqueue import JobQueue
+from src.helper.playlist import iter_ids
+from src.helper.scheduler import schedule_jobs
+
+# utils
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# id file: one id (or url) per line, empty lines and '#' comments are ignored
+
+def read_ids(lines: Iterable[str]) -> List[str]:
+    ids: List[str] = []
+    for line in lines:
+        entry = line.split("#")[0].strip()
+        if entry != "":
+            ids.append(entry)
+    return ids
+
+def run_batch(youtube_ids: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, resume: bool = False, adaptive: bool = False) -> List[Job]:
+    path = Path(path)
+    workers = max(1, workers)
+
+    queue = JobQueue.open(path)
+    jobs: List[Job] = []
+
+    # unfinished jobs of a previous run (resume), then ids and playlist/channel urls
+    #  -> jobs, created while the downloads are running
+
+    def create_jobs() -> Generator[Job]:
+        seen = set()
+
+        if resume:
+            unfinished = queue.unfinished()
+            Trace.info(f"resume: {len(unfinished)} unfinished job(s)")
+
+            for job in unfinished:
+                seen.add(job.youtube_id)
+                job.listeners.append(report_job)
+                jobs.append(job)
+                yield job
+
+        for youtube_id in iter_ids(youtube_ids, debug):
+            if youtube_id in seen:
+                Trace.warning(f"duplicate id '{youtube_id}' skipped")
+                continue
+            seen.add(youtube_id)
+
+            job = Job(youtube_id, audio_only, force_language)
+            job.listeners.append(report_job)
+            queue.add(job)
+            jobs.append(job)
+            yield job
+
+    Trace.action(f"batch: {'max. ' if adaptive else ''}{workers} download(s), {metadata_workers} metadata request(s), {host_limit} per host")
+
+    start_time = time.time()
+    asyncio.run(schedule_jobs(create_jobs(), path, debug, metadata_workers=metadata_workers, transfer_workers=workers, host_limit=host_limit, adaptive=adaptive))
+
+    Trace.result(f"batch: {len(jobs)} job(s) - {time.time() - start_time:.2f} sec")
+    return jobs
+
+def report_job(job: Job) -> None:
+    if job.state in {"done", "failed"}:
+        Trace.result(f"[{job.state}] {job.youtube_id} - {job.duration:.2f} sec - {format_bytes(job.bytes)} - '{job.title}'")
+
+def report_batch(jobs: List[Job]) -> None:
+    done   = [job for job in jobs if job.state == "done"]
+    failed = [job for job in jobs if job.state != "done"]
+
+    total_bytes    = sum(job.bytes for job in done)
+    total_duration = sum(job.duration for job in jobs)
+
+    Trace.result(f"summary: {len(done)} done, {len(failed)} failed - {format_bytes(total_bytes)} - {total_duration:.2f} sec (sum of all jobs)")
+
+    for job in failed:
+        Trace.error(f"failed: {job.youtube_id} - {job.error}")
+
+def format_bytes(size: float) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
@@ -0,0 +1,218 @@
+"""
+    © Jürgen Schoenemeyer, 19.10.2026 00:30
+
+    src/helper/columns.py
+
+    columnar format table of many info jsons (one row per https video-only / audio-only format)
+     - format columns: video (row of the video table), kind (0 = video, 1 = audio), codec, language,
+                       height, fps, tbr, quality, audio_channels, size
+     - video columns:  channel (row = index in the id table)
+     - codec, language, channel: interned -> index into a string table
+     - numpy installed (optional extra 'columns'): numpy arrays (vectorised queries), else stdlib 'array' (same file format)
+
+    file (e.g. 'formats.columns'):
+     - line 1: json header (string tables, columns: typecode, length)
+     - then the raw column data (little endian) in the order of the header
+
+    PUBLIC:
+     - columns_from_folder(path: Path) -> Dict[str, Any]
+     - build_columns(infos: Iterable[Dict[str, Any]]) -> Dict[str, Any]
+     - save_columns(columns: Dict[str, Any], filepath: Path | str) -> None
+     - load_columns(filepath: Path | str) -> Dict[str, Any]
+     - codec_share(columns: Dict[str, Any], codec: str, min_height: int = 0) -> Dict[str, Tuple[int, int]]
+     - report_share(share: Dict[str, Tuple[int, int]], codec: str, min_height: int) -> None
+
+    PRIVATE:
+     - to_column(values: array.array[Any]) -> Any
+     - intern(table: Dict[str, int], value: str) -> int
+"""
+from __future__ import annotations
+
+import array
+import importlib.util
+import json
+import sys
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+# helper
+from src.helper.info_json import SIDECAR_EXTENSIONS
+from src.helper.selection import format_table
+
+# utils
+from src.utils.file import listdir_match_extention
+from src.utils.json_fields import import_json_fields
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+if HAS_NUMPY:
+    import numpy as np  # type: ignore[import-not-found]
+
+# column -> array typecode (same as numpy dtype.char)
+
+FORMAT_COLUMNS = {
+    "video":          "I", # uint32 -> video table
+    "kind":           "B", # uint8: 0 = video, 1 = audio
+    "codec":          "H", # uint16 -> codecs
+    "language":       "H", # uint16 -> languages
+    "height":         "H",
+    "fps":            "f",
+    "tbr":            "f",
+    "quality":        "f",
+    "audio_channels": "B",
+    "size":           "q", # int64 bytes (0 = unknown)
+}
+
+VIDEO_COLUMNS = {
+    "channel": "I", # uint32 -> channels (row = index in ids)
+}
+
+STRING_TABLES = ("codecs", "languages", "ids", "channels") # ids: one per video (not interned)
+
+# fields of the info json (src/utils/json_fields.py) - 'channel' comes after 'automatic_captions'
+
+COLUMN_FIELDS = {
+    "id":       True,
+    "channel":  True,
+    "duration": True,
+    "formats":  True,
+}
+
+# all info jsons of a folder (only the fields of COLUMN_FIELDS are decoded)
+
+def columns_from_folder(path: Path) -> Dict[str, Any]:
+    files, _ = listdir_match_extention( path, SIDECAR_EXTENSIONS )
+
+    def infos() -> Iterable[Dict[str, Any]]:
+        for file in files:
+            info = import_json_fields( path, file, COLUMN_FIELDS )
+            if info is not None and "id" in info:
+                yield info
+
+    columns = build_columns(infos())
+    Trace.info( f"{len(columns['ids'])} video(s) - {len(columns['video'])} format(s) - {len(columns['codecs'])} codec(s), {len(columns['languages'])} language(s)" )
+    return columns
+
+def build_columns(infos: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    tables: Dict[str, Dict[str, int]] = {name: {} for name in STRING_TABLES if name != "ids"}
+    ids: List[str] = []
+    values = {name: array.array(typecode) for name, typecode in (FORMAT_COLUMNS | VIDEO_COLUMNS).items()}
+
+    for info in infos:
+        video = len(values["channel"])
+        ids.append(str(info["id"]))
+        values["channel"].append(intern(tables["channels"], str(info.get("channel") or "")))
+
+        for row in format_table(info):
+            values["video"].append(video)
+            values["kind"].append(0 if row["kind"] == "video" else 1)
+            values["codec"].append(intern(tables["codecs"], row["codec"]))
+            values["language"].append(intern(tables["languages"], row["language"]))
+            values["height"].append(min(row["height"], 0xFFFF))
+            values["fps"].append(row["fps"])
+            values["tbr"].append(row["tbr"])
+            values["quality"].append(row["quality"])
+            values["audio_channels"].append(min(row["channels"], 0xFF))
+            values["size"].append(row["size"])
+
+    columns: Dict[str, Any] = {name: list(table) for name, table in tables.items()}
+    columns["ids"] = ids
+    for name, column in values.items():
+        columns[name] = to_column(column)
+    return columns
+
+def save_columns(columns: Dict[str, Any], filepath: Path | str) -> None:
+    header = {name: columns[name] for name in STRING_TABLES}
+    header["columns"] = [[name, typecode, len(columns[name])] for name, typecode in (FORMAT_COLUMNS | VIDEO_COLUMNS).items()]
+
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with filepath.open("wb") as f:
+        f.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+        for name in FORMAT_COLUMNS | VIDEO_COLUMNS:
+            column = columns[name]
+            if HAS_NUMPY:
+                f.write(column.astype(column.dtype.newbyteorder("<")).tobytes())
+            else:
+                if sys.byteorder != "little":
+                    column = array.array(column.typecode, column)
+                    column.byteswap()
+                f.write(column.tobytes())
+
+def load_columns(filepath: Path | str) -> Dict[str, Any]:
+    data = Path(filepath).read_bytes()
+
+    end = data.index(b"\n")
+    header = json.loads(data[:end])
+
+    columns: Dict[str, Any] = {name: header[name] for name in STRING_TABLES}
+
+    pos = end + 1
+    for name, typecode, length in header["columns"]:
+        column = array.array(typecode)
+        size = column.itemsize * length
+        if HAS_NUMPY:
+            columns[name] = np.frombuffer(data, dtype=np.dtype(typecode).newbyteorder("<"), count=length, offset=pos)
+        else:
+            column.frombytes(data[pos:pos + size])
+            if sys.byteorder != "little":
+                column.byteswap()
+            columns[name] = column
+        pos += size
+
+    return columns
+
+# per channel: (videos with a 'codec' video format >= min_height, all videos)
+#  e.g. codec_share(columns, "av01", 1080) -> {"<channel>": (12, 40), ...}
+
+def codec_share(columns: Dict[str, Any], codec: str, min_height: int = 0) -> Dict[str, Tuple[int, int]]:
+    channels: List[str] = columns["channels"]
+    codec_index = columns["codecs"].index(codec) if codec in columns["codecs"] else -1
+
+    if HAS_NUMPY:
+        totals = np.bincount(columns["channel"], minlength=len(channels))
+
+        mask = (columns["codec"] == codec_index) & (columns["height"] >= min_height) & (columns["kind"] == 0)
+        videos = np.unique(columns["video"][mask])
+        hits = np.bincount(columns["channel"][videos], minlength=len(channels))
+
+        return {channels[i]: (int(hits[i]), int(totals[i])) for i in range(len(channels)) if totals[i] > 0}
+
+    totals_list = [0] * len(channels)
+    for channel in columns["channel"]:
+        totals_list[channel] += 1
+
+    videos_set = set()
+    for video, kind, codec_value, height in zip(columns["video"], columns["kind"], columns["codec"], columns["height"], strict=True):
+        if kind == 0 and codec_value == codec_index and height >= min_height:
+            videos_set.add(video)
+
+    hits_list = [0] * len(channels)
+    for video in videos_set:
+        hits_list[columns["channel"][video]] += 1
+
+    return {channels[i]: (hits_list[i], totals_list[i]) for i in range(len(channels)) if totals_list[i] > 0}
+
+def report_share(share: Dict[str, Tuple[int, int]], codec: str, min_height: int) -> None:
+    for channel, (hits, total) in sorted(share.items(), key=lambda item: -item[1][0] / item[1][1]):
+        Trace.result( f"{channel or '-'}: {hits} / {total} ({100 * hits / total:.0f} %) with {codec} >= {min_height}p" )
+
+    hits_all  = sum(hits for hits, _ in share.values())
+    total_all = sum(total for _, total in share.values())
+    if total_all > 0:
+        Trace.result( f"all: {hits_all} / {total_all} ({100 * hits_all / total_all:.0f} %) with {codec} >= {min_height}p" )
+
+def to_column(values: array.array[Any]) -> Any:
+    if HAS_NUMPY:
+        return np.array(values) # buffer protocol -> same dtype
+    return values
+
+def intern(table: Dict[str, int], value: str) -> int:
+    index = table.get(value)
+    if index is None:
+        index = table[value] = len(table)
+    return index
@@ -0,0 +1,285 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 18:20
+
+    src/helper/daemon.py
+
+    long-running download service (localhost http api)
+     - other listen addresses only with a token: 'Authorization: Bearer <token>' (all requests)
+     - yt-dlp imported, settings.yaml loaded and YoutubeDL (metadata) warm -> a new job starts in milliseconds
+     - jobs run in one event loop thread with the limits of the batch scheduler
+     - jobs are stored in the job queue of the destination -> unfinished jobs are resumed after a restart
+
+    http api (json):
+     - POST /jobs           {"youtube_id": "<id or url>", "audio": false, "language": ""} -> 202 job
+     - GET  /jobs           -> list of jobs
+     - GET  /jobs/<job_id>  -> job: state, progress (bytes, streams), filepath, error
+     - GET  /status         -> jobs per state, uptime
+
+    PUBLIC:
+    class Daemon:
+      - Daemon(dest_video: Path, dest_audio: Path, debug: bool = False, *, metadata_workers: int = 2, transfer_workers: int = 2, host_limit: int = 2, adaptive: bool = False)
+      - Daemon.start() -> None
+      - Daemon.stop() -> None
+      - Daemon.submit(youtube_id: str, audio_only: bool = False, language: str = "") -> Job
+      - Daemon.resume() -> int
+      - Daemon.get(job_id: str) -> Job | None
+      - Daemon.jobs() -> List[Job]
+      - Daemon.status() -> Dict[str, Any]
+
+     - serve(daemon: Daemon, host: str = "127.0.0.1", port: int = 8765, token: str = "") -> None
+
+    PRIVATE:
+     - report_job(job: Job) -> None
+     - report_future(job: Job, future: Future[Any]) -> None
+     - is_loopback(host: str) -> bool
+     - request_handler(daemon: Daemon, token: str) -> type[BaseHTTPRequestHandler]
+"""
+from __future__ import annotations
+
+import asyncio
+import hmac
+import ipaddress
+import json
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# helper
+from src.helper.job import Job
+from src.helper.jobqueue import JobQueue
+from src.helper.playlist import is_collection_url, parse_video_id
+from src.helper.scheduler import create_limits, run_job
+
+# utils
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from pathlib import Path
+
+MAX_JOBS = 1000 # finished jobs kept for status requests
+
+class Daemon:
+    def __init__(self, dest_video: Path, dest_audio: Path, debug: bool = False, *, metadata_workers: int = 2, transfer_workers: int = 2, host_limit: int = 2, adaptive: bool = False) -> None:
+        self.dest_video = dest_video
+        self.dest_audio = dest_audio
+        self.debug = debug
+
+        self.metadata_workers = max(1, metadata_workers)
+        self.transfer_workers = max(1, transfer_workers)
+        self.host_limit       = max(1, host_limit)
+        self.adaptive         = adaptive
+
+        self.start_time = time.time()
+
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._loop = asyncio.new_event_loop()
+        self._executor = ThreadPoolExecutor(max_workers=self.metadata_workers + self.transfer_workers, thread_name_prefix="yt-dlp")
+        self._limits: Dict[str, Any] = {}
+        self._thread = threading.Thread(target=self._run_loop, name="daemon", daemon=True)
+
+    def start(self) -> None:
+        ready = threading.Event()
+        self._loop.call_soon(ready.set)
+        self._thread.start()
+        ready.wait()
+
+        Trace.action(f"daemon: {self.transfer_workers} download(s), {self.metadata_workers} metadata request(s), {self.host_limit} per host")
+
+        count = self.resume()
+        if count > 0:
+            Trace.action(f"daemon: {count} unfinished job(s) resumed")
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, youtube_id: str, audio_only: bool = False, language: str = "") -> Job:
+        job = Job(youtube_id, audio_only, language)
+
+        path = self.dest_audio if audio_only else self.dest_video
+        JobQueue.open(path).add(job)
+
+        self._schedule(job, path)
+        return job
+
+    # unfinished jobs of the previous daemon run (crash, restart) -> same job ids
+
+    def resume(self) -> int:
+        count = 0
+        for path in (self.dest_video, self.dest_audio):
+            for job in JobQueue.open(path).unfinished():
+                self._schedule(job, path)
+                count += 1
+        return count
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def status(self) -> Dict[str, Any]:
+        states: Dict[str, int] = {}
+        for job in self.jobs():
+            states[job.state] = states.get(job.state, 0) + 1
+
+        return {
+            "uptime": round(time.time() - self.start_time, 1),
+            "jobs":   states,
+        }
+
+    def _schedule(self, job: Job, path: Path) -> None:
+        job.listeners.append(report_job)
+
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._cleanup()
+
+        future = asyncio.run_coroutine_threadsafe(run_job(job, path, self.debug, self._limits), self._loop)
+        future.add_done_callback(partial(report_future, job))
+        Trace.info(f"daemon: job {job.job_id} '{job.youtube_id}' queued")
+
+    # semaphores of the limits belong to the loop -> created in the loop thread
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._limits.update(create_limits(self._executor, self.metadata_workers, self.transfer_workers, self.host_limit, self.adaptive))
+        self._loop.run_forever()
+
+    # oldest finished jobs are dropped (lock held by the caller)
+
+    def _cleanup(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.state in {"done", "failed"}]
+        for job_id in finished[:max(0, len(self._jobs) - MAX_JOBS)]:
+            del self._jobs[job_id]
+
+def report_job(job: Job) -> None:
+    if job.state in {"done", "failed"}:
+        Trace.result(f"daemon: job {job.job_id} [{job.state}] {job.youtube_id} - {job.duration:.2f} sec - '{job.title}'")
+
+# exception outside of run_blocking (e.g. in the scheduler) -> logged, job failed
+
+def report_future(job: Job, future: Future[Any]) -> None:
+    if future.cancelled():
+        return
+
+    err = future.exception()
+    if err is None:
+        return
+
+    Trace.error(f"daemon: job {job.job_id} '{job.youtube_id}': {type(err).__name__}: {err}")
+    if job.state not in {"done", "failed"}:
+        job.error = job.error or str(err) or type(err).__name__
+        job.set_state("failed")
+
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def serve(daemon: Daemon, host: str = "127.0.0.1", port: int = 8765, token: str = "") -> None:
+    if token == "" and not is_loopback(host):
+        Trace.fatal(f"daemon: '{host}' is not a loopback address -> token required (--token)")
+        return
+
+    server = ThreadingHTTPServer((host, port), request_handler(daemon, token))
+    daemon.start()
+
+    Trace.action(f"daemon: listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        daemon.stop()
+
+def request_handler(daemon: Daemon, token: str) -> type[BaseHTTPRequestHandler]:
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if not self.authorized():
+                return
+
+            parts = self.path.strip("/").split("/")
+
+            if parts == ["status"]:
+                self.send_json(HTTPStatus.OK, daemon.status())
+
+            elif parts == ["jobs"]:
+                self.send_json(HTTPStatus.OK, [job.as_dict() for job in daemon.jobs()])
+
+            elif len(parts) == 2 and parts[0] == "jobs":
+                job = daemon.get(parts[1])
+                if job is None:
+                    self.send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown job '{parts[1]}'"})
+                else:
+                    self.send_json(HTTPStatus.OK, job.as_dict())
+
+            else:
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown path '{self.path}'"})
+
+        def do_POST(self) -> None:
+            if not self.authorized():
+                return
+
+            if self.path.strip("/") != "jobs":
+                self.send_json(HTTPStatus.NOT_FOUND, {"error": f"unknown path '{self.path}'"})
+                return
+
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+                request = json.loads(self.rfile.read(length) or b"{}")
+
+                youtube_id = parse_video_id(str(request.get("youtube_id", "")))
+
+            except (ValueError, AttributeError) as err: # json.JSONDecodeError is a ValueError
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": str(err)})
+                return
+
+            if is_collection_url(youtube_id):
+                self.send_json(HTTPStatus.BAD_REQUEST, {"error": "playlist/channel url -> src/main.py or src/sync.py"})
+                return
+
+            job = daemon.submit(youtube_id, bool(request.get("audio", False)), str(request.get("language", "")))
+            self.send_json(HTTPStatus.ACCEPTED, job.as_dict())
+
+        # token set -> 'Authorization: Bearer <token>' required, else 401
+
+        def authorized(self) -> bool:
+            if token == "":
+                return True
+
+            value = self.headers.get("Authorization") or ""
+            if hmac.compare_digest(value.encode("utf-8"), f"Bearer {token}".encode()):
+                return True
+
+            self.send_json(HTTPStatus.UNAUTHORIZED, {"error": "token required"})
+            return False
+
+        def send_json(self, status: HTTPStatus, data: Any) -> None:
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            pass # requests are not logged (status polling)
+
+    return Handler
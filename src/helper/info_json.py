@@ -0,0 +1,145 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 13:10
+
+    src/helper/info_json.py
+
+    info JSON sidecar (<path>/<channel>/<title>.json) -> reuse instead of a new extraction
+
+    compact sidecar (settings.yaml 'info_json.compact: true'):
+     - without 'automatic_captions', 'heatmap', 'requested_formats' (copies of 'formats')
+     - 'http_headers' of the formats only once ('_http_headers'), restored when loaded
+     - 'drop_urls: true': also without the signed format urls -> no reuse (new extraction)
+     - minified json, 'compression: gzip | zstd' -> <title>.json.gz | <title>.json.zst
+       (import_json, import_json_fields: decompressed by the suffix)
+
+    PUBLIC:
+     - info_expire(info: Dict[str, Any]) -> float
+     - is_info_valid(info: Dict[str, Any], margin: float) -> bool
+     - load_info_json(filepath: Path | str, margin: float) -> Dict[str, Any] | None
+     - export_info_json(folderpath: Path, title: str, info: Dict[str, Any], timestamp: float) -> Path
+     - compact_info(info: Dict[str, Any], drop_urls: bool = False) -> Dict[str, Any]
+     - expand_info(info: Dict[str, Any]) -> Dict[str, Any]
+"""
+from __future__ import annotations
+
+import re
+import time
+
+from pathlib import Path
+from typing import Any, Dict
+
+# utils
+from src.utils.file import export_json, import_json
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+SIDECAR_EXTENSIONS = ["json", "json.gz", "json.zst"]
+
+COMPRESSION = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+DROP_KEYS     = ("automatic_captions", "heatmap", "requested_formats")
+DROP_URL_KEYS = ("url", "manifest_url", "fragment_base_url", "fragments")
+
+# signed googlevideo urls:
+#  - https://rr3---sn-4g5edn6r.googlevideo.com/videoplayback?expire=1743039977&ei=...
+#  - https://manifest.googlevideo.com/api/manifest/hls_playlist/expire/1743039977/ei/...
+
+EXPIRE_PATTERN = re.compile(r"[?&/]expire[=/](\d+)")
+
+# earliest 'expire' of all https formats (0 -> unknown)
+
+def info_expire(info: Dict[str, Any]) -> float:
+    expire = 0.0
+    for format in info.get("formats") or []:
+        if format.get("protocol") != "https":
+            continue
+
+        match = EXPIRE_PATTERN.search(format.get("url", ""))
+        if match is None:
+            continue
+
+        value = float(match.group(1))
+        if expire == 0 or value < expire:
+            expire = value
+
+    return expire
+
+def is_info_valid(info: Dict[str, Any], margin: float) -> bool:
+    expire = info_expire(info)
+    if expire == 0:
+        return False
+
+    return expire - time.time() > margin
+
+def load_info_json(filepath: Path | str, margin: float) -> Dict[str, Any] | None:
+    filepath = Path(filepath)
+
+    info = import_json(filepath.parent, filepath.name, show_error=False)
+    if info is None:
+        return None
+
+    info = expand_info(info)
+    if not is_info_valid(info, margin): # no urls (drop_urls) -> not valid
+        Trace.info(f"info json expired '{filepath.name}'")
+        return None
+
+    return info
+
+# sidecar of the settings (compact, compression) -> filepath
+
+def export_info_json(folderpath: Path, title: str, info: Dict[str, Any], timestamp: float) -> Path:
+    compact     = bool(Prefs.get("info_json.compact", False))
+    compression = str(Prefs.get("info_json.compression", "none"))
+
+    if compression not in COMPRESSION:
+        Trace.error(f"info_json.compression: unknown '{compression}' -> none")
+        compression = "none"
+
+    filename = title + ".json" + COMPRESSION[compression]
+    if compact:
+        info = compact_info(info, bool(Prefs.get("info_json.drop_urls", False)))
+
+    export_json(folderpath, filename, info, timestamp=timestamp, minified=compact)
+    return folderpath / filename
+
+def compact_info(info: Dict[str, Any], drop_urls: bool = False) -> Dict[str, Any]:
+    result = {key: value for key, value in info.items() if key not in DROP_KEYS}
+
+    http_headers = None
+    formats = []
+    for format in info.get("formats") or []:
+        entry = dict(format)
+
+        headers = entry.get("http_headers")
+        if headers is not None:
+            if http_headers is None:
+                http_headers = headers
+            if headers == http_headers:
+                del entry["http_headers"]
+
+        if drop_urls:
+            for key in DROP_URL_KEYS:
+                entry.pop(key, None)
+
+        formats.append(entry)
+
+    if "formats" in info:
+        result["formats"] = formats
+    if http_headers is not None:
+        result["_http_headers"] = http_headers
+
+    return result
+
+# compact sidecar -> 'http_headers' of every format again (yt-dlp download)
+
+def expand_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    http_headers = info.pop("_http_headers", None)
+    if http_headers is not None:
+        for format in info.get("formats") or []:
+            format.setdefault("http_headers", dict(http_headers))
+
+    return info
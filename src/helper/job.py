@@ -0,0 +1,92 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 12:05
+
+    src/helper/job.py
+
+    PUBLIC:
+    class Job:
+      - Job(youtube_id: str, audio_only: bool = False, language: str = "")
+      - Job.set_state(state: str) -> None
+      - Job.add_bytes(filename: str, downloaded: int) -> None
+      - Job.streams() -> Dict[str, int]
+      - Job.as_dict() -> Dict[str, Any]
+"""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+
+from typing import Any, Callable, Dict, List
+
+# states: queued -> metadata -> downloading -> merging -> done | failed
+
+class Job:
+    def __init__(self, youtube_id: str, audio_only: bool = False, language: str = "") -> None:
+        self.job_id:     str   = uuid.uuid4().hex[:12]
+        self.youtube_id: str   = youtube_id
+        self.audio_only: bool  = audio_only
+        self.language:   str   = language
+
+        self.state:      str   = "queued"
+        self.title:      str   = ""
+        self.channel:    str   = ""
+        self.format:     str   = ""
+        self.filepath:   str   = ""
+        self.error:      str   = ""
+        self.timestamp:  float = 0.0 # upload
+
+        self.bytes:      int   = 0   # downloaded bytes (all streams)
+        self.size:       int   = 0   # estimated bytes of the selected formats (0 = unknown)
+        self.start_time: float = 0.0
+        self.duration:   float = 0.0
+
+        self.listeners: List[Callable[[Job], None]] = []
+
+        self._streams: Dict[str, int] = {} # filename -> downloaded bytes
+        self._lock = threading.Lock()
+
+    def set_state(self, state: str) -> None:
+        if state == "metadata" and self.start_time == 0.0:
+            self.start_time = time.time()
+
+        if state in {"done", "failed"} and self.start_time != 0.0:
+            self.duration = time.time() - self.start_time
+
+        self.state = state
+        self._notify()
+
+    def add_bytes(self, filename: str, downloaded: int) -> None:
+        with self._lock:
+            self._streams[filename] = downloaded
+            self.bytes = sum(self._streams.values())
+        self._notify()
+
+    # downloaded bytes per stream file (video, audio)
+
+    def streams(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._streams)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id":     self.job_id,
+            "youtube_id": self.youtube_id,
+            "audio_only": self.audio_only,
+            "language":   self.language,
+            "state":      self.state,
+            "title":      self.title,
+            "channel":    self.channel,
+            "format":     self.format,
+            "filepath":   self.filepath,
+            "error":      self.error,
+            "timestamp":  self.timestamp,
+            "bytes":      self.bytes,
+            "size":       self.size,
+            "streams":    self.streams(),
+            "duration":   round(self.duration, 2),
+        }
+
+    def _notify(self) -> None:
+        for listener in self.listeners:
+            listener(self)
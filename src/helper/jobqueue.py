@@ -0,0 +1,267 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 19:10
+
+    src/helper/jobqueue.py
+
+    persistent job queue (SQLite) per destination folder -> <path>/jobs.sqlite
+     - every state change of a job is written at once (queued, metadata, downloading, merging, done, failed)
+     - after a crash or restart: unfinished jobs are loaded again as 'queued'
+       -> the downloaders continue their '.part' files (yt-dlp: continuedl, ranged: '.part.ranges')
+     - worker mode (several hosts, shared output tree): jobs are claimed with a time-limited lease,
+       the worker extends it (heartbeat), jobs with an expired lease are claimed again
+       -> settings.yaml 'queue.shared: true' for a queue on a network filesystem
+
+    PUBLIC:
+    class JobQueue:
+      - JobQueue.open(path: Path | str) -> JobQueue
+      - JobQueue.add(job: Job, owned: bool = True) -> None
+      - JobQueue.claim(lease: float, max_attempts: int = 3) -> Job | None
+      - JobQueue.heartbeat(lease: float) -> int
+      - JobQueue.update(job: Job) -> None
+      - JobQueue.unfinished() -> List[Job]
+      - JobQueue.counts() -> Dict[str, int]
+
+     - worker_id() -> str
+
+    PRIVATE:
+     - owner_gone(worker: str) -> bool
+     - process_alive(pid: int) -> bool
+"""
+from __future__ import annotations
+
+import os
+import platform
+import socket
+import sqlite3
+import threading
+import time
+
+from pathlib import Path
+from typing import ClassVar, Dict, List
+
+# helper
+from src.helper.job import Job
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+QUEUE_NAME = "jobs.sqlite"
+
+FINISHED = ("done", "failed")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id     TEXT PRIMARY KEY,
+    youtube_id TEXT NOT NULL,
+    audio_only INTEGER NOT NULL,
+    language   TEXT NOT NULL,
+    state      TEXT NOT NULL,
+    error      TEXT NOT NULL,
+    filepath   TEXT NOT NULL,
+    created    REAL NOT NULL,
+    updated    REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state);
+"""
+
+# lease columns (worker mode) - added to queues of older versions
+
+LEASE_COLUMNS = {
+    "worker":      "TEXT NOT NULL DEFAULT ''", # '' -> free for any worker, '<host>:<pid>'
+    "lease_until": "REAL NOT NULL DEFAULT 0",  # 0 -> no lease (owned by a batch run)
+    "attempts":    "INTEGER NOT NULL DEFAULT 0",
+}
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}" # pid at call time (forked processes)
+
+# owner '<host>:<pid>' of a batch job -> process no longer running (only checkable on the same host)
+
+def owner_gone(worker: str) -> bool:
+    host, _, pid = worker.rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit():
+        return False
+    return not process_alive(int(pid))
+
+def process_alive(pid: int) -> bool:
+    if platform.system() == "Windows":
+        import ctypes  # noqa: PLC0415
+
+        kernel32 = ctypes.windll.kernel32                       # type: ignore[attr-defined, reportAttributeAccessIssue] # -> Linux
+        handle = kernel32.OpenProcess(0x1000, 0, pid)           # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259                       # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0) # signal 0: existence check only
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True     # process of another user
+    return True
+
+class JobQueue:
+    instances: ClassVar[Dict[Path, JobQueue]] = {}
+    instances_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.filepath = path / QUEUE_NAME
+        self.lock = threading.Lock()
+        self.states: Dict[str, str] = {} # job_id -> last written state
+
+        # shared queue (network filesystem, several hosts): no WAL (needs shared memory of one host)
+
+        self.shared = bool(Prefs.get("queue.shared", False))
+
+        self.connection = sqlite3.connect(self.filepath, timeout=60, check_same_thread=False)
+        self.connection.row_factory = sqlite3.Row
+        with self.connection:
+            self.connection.execute("PRAGMA journal_mode=DELETE" if self.shared else "PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=FULL") # state change must survive a power loss
+            self.connection.executescript(SCHEMA)
+
+            columns = {row["name"] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+            for column, definition in LEASE_COLUMNS.items():
+                if column not in columns:
+                    self.connection.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+
+    @classmethod
+    def open(cls, path: Path | str) -> JobQueue:
+        path = Path(path).resolve()
+        with cls.instances_lock:
+            if path not in cls.instances:
+                cls.instances[path] = JobQueue(path)
+            return cls.instances[path]
+
+    # new job -> older unfinished jobs of the same video are replaced: not yet claimed (enqueued) or with an expired lease
+    #  - jobs of a running batch or leased by a running worker are not touched
+    #  - owned: job runs in this process (batch, daemon), else free for the workers (enqueue)
+
+    def add(self, job: Job, owned: bool = True) -> None:
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.execute(
+                f"DELETE FROM jobs WHERE youtube_id = ? AND job_id != ? AND state NOT IN {FINISHED} AND (worker = '' OR (lease_until > 0 AND lease_until < ?))",  # noqa: S608
+                (job.youtube_id, job.job_id, now),
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, youtube_id, audio_only, language, state, error, filepath, created, updated, worker) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job.job_id, job.youtube_id, int(job.audio_only), job.language, job.state, job.error, job.filepath, now, now, worker_id() if owned else ""),
+            )
+            self.states[job.job_id] = job.state
+
+        if owned:
+            job.listeners.append(self.update)
+
+    # worker mode: oldest free job or job with an expired lease (worker died) -> leased for 'lease' sec
+    #  - BEGIN IMMEDIATE -> write lock of the database file, no second worker gets the same job
+    #  - too many expired leases -> failed (e.g. the job kills every worker)
+
+    def claim(self, lease: float, max_attempts: int = 3) -> Job | None:
+        with self.lock:
+            while True:
+                now = time.time()
+                with self.connection:
+                    self.connection.execute("BEGIN IMMEDIATE")
+                    row = self.connection.execute(
+                        f"SELECT * FROM jobs WHERE state NOT IN {FINISHED} AND (worker = '' OR (lease_until > 0 AND lease_until < ?)) ORDER BY created LIMIT 1",  # noqa: S608
+                        (now,),
+                    ).fetchone()
+
+                    if row is None:
+                        return None
+
+                    if row["attempts"] >= max_attempts:
+                        self.connection.execute(
+                            "UPDATE jobs SET state = 'failed', error = ?, lease_until = 0, updated = ? WHERE job_id = ?",
+                            (f"lease expired {row['attempts']} times ({row['worker']})", now, row["job_id"]),
+                        )
+                        continue
+
+                    self.connection.execute(
+                        "UPDATE jobs SET state = 'queued', worker = ?, lease_until = ?, attempts = attempts + 1, updated = ? WHERE job_id = ?",
+                        (worker_id(), now + lease, now, row["job_id"]),
+                    )
+
+                if row["worker"] != "":
+                    Trace.warning(f"queue: lease of '{row['worker']}' expired -> {row['youtube_id']} again")
+
+                job = Job(row["youtube_id"], bool(row["audio_only"]), row["language"])
+                job.job_id = row["job_id"]
+                self.states[job.job_id] = job.state
+                break
+
+        job.listeners.append(self.update)
+        return job
+
+    # worker mode: extend the leases of all running jobs of this worker -> number of jobs
+
+    def heartbeat(self, lease: float) -> int:
+        now = time.time()
+        with self.lock, self.connection:
+            cursor = self.connection.execute(
+                f"UPDATE jobs SET lease_until = ? WHERE worker = ? AND lease_until > 0 AND state NOT IN {FINISHED}",  # noqa: S608
+                (now + lease, worker_id()),
+            )
+            return cursor.rowcount
+
+    # job listener -> only state changes are written (not the progress)
+
+    def update(self, job: Job) -> None:
+        with self.lock:
+            if self.states.get(job.job_id) == job.state:
+                return
+
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE jobs SET state = ?, error = ?, filepath = ?, updated = ?, lease_until = CASE WHEN ? THEN 0 ELSE lease_until END WHERE job_id = ?",
+                    (job.state, job.error, job.filepath, time.time(), job.state in FINISHED, job.job_id),
+                )
+            self.states[job.job_id] = job.state
+
+    # jobs of a batch run interrupted by a crash or restart -> 'queued' again (same job id), owned by this process
+    #  - owner process on this host no longer running (a restarted process may get the same pid -> not a job of this instance)
+    #  - not touched: enqueued jobs (worker ''), leased jobs (-> claim), jobs of running batches and of other hosts
+
+    def unfinished(self) -> List[Job]:
+        own = worker_id()
+
+        with self.lock:
+            rows = self.connection.execute(
+                f"SELECT * FROM jobs WHERE state NOT IN {FINISHED} AND worker != '' AND lease_until = 0 ORDER BY created",  # noqa: S608
+            ).fetchall()
+            rows = [row for row in rows if (row["worker"] == own and row["job_id"] not in self.states) or (row["worker"] != own and owner_gone(row["worker"]))]
+
+        jobs = []
+        for row in rows:
+            with self.lock, self.connection:
+                cursor = self.connection.execute(
+                    "UPDATE jobs SET state = 'queued', worker = ?, updated = ? WHERE job_id = ? AND worker = ? AND lease_until = 0",
+                    (own, time.time(), row["job_id"], row["worker"]),
+                )
+                if cursor.rowcount == 0:
+                    continue # taken over by another process in the meantime
+
+                job = Job(row["youtube_id"], bool(row["audio_only"]), row["language"])
+                job.job_id = row["job_id"]
+                self.states[job.job_id] = job.state
+
+            job.listeners.append(self.update)
+            jobs.append(job)
+
+        return jobs
+
+    def counts(self) -> Dict[str, int]:
+        with self.lock:
+            rows = self.connection.execute("SELECT state, COUNT(*) AS count FROM jobs GROUP BY state").fetchall()
+        return {row["state"]: row["count"] for row in rows}
@@ -0,0 +1,127 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 16:45
+
+    src/helper/playlist.py
+
+    playlist and channel urls -> video ids (flat extraction, lazy)
+     - https://www.youtube.com/playlist?list=PL...
+     - https://www.youtube.com/@handle, .../@handle/videos, .../channel/UC..., .../c/name, .../user/name
+
+    PUBLIC:
+     - is_collection_url(value: str) -> bool
+     - parse_video_id(value: str) -> str
+     - expand_url(url: str, debug: bool = False) -> Generator[Dict[str, Any]]
+     - iter_ids(values: Iterable[str], debug: bool = False) -> Generator[str]
+
+    PRIVATE:
+     - iter_entries(ydl: yt_dlp.YoutubeDL, url: str, depth: int) -> Generator[Dict[str, Any]]
+"""
+from __future__ import annotations
+
+import re
+
+from typing import TYPE_CHECKING, Any, Dict, Generator
+
+import yt_dlp  # type: ignore[import-untyped]
+
+from yt_dlp.utils import DownloadError  # type: ignore[import-untyped]
+
+# utils
+from src.utils.trace import Color, Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+COLLECTION_PATTERN = re.compile(r"youtube\.com/(@|channel/|c/|user/|playlist\?)")
+
+MAX_DEPTH = 2 # channel -> tabs (videos, shorts, streams) -> videos
+
+def is_collection_url(value: str) -> bool:
+    if "?v=" in value:
+        return False # watch?v=...&list=... -> single video (as before)
+
+    return "list=" in value or COLLECTION_PATTERN.search(value) is not None
+
+# 11 char id, watch url, youtu.be or shorts url -> id
+# playlist or channel url -> unchanged (expanded later)
+
+def parse_video_id(value: str) -> str:
+    value = value.strip()
+    if is_collection_url(value):
+        return value
+
+    if "?v=" in value:
+        value = value.split("?v=")[1][:11]
+    elif "youtu.be/" in value:
+        value = value.split("youtu.be/")[1][:11]
+    elif "/shorts/" in value:
+        value = value.split("/shorts/")[1][:11]
+
+    if len(value) != 11:
+        msg = f"length = {len(value)} (should be 11)"
+        raise ValueError(msg)
+    return value
+
+# flat entries as they arrive (page by page), e.g. {'id': 'rU5mxh5tsI0', 'title': ..., 'timestamp': ...}
+
+def expand_url(url: str, debug: bool = False) -> Generator[Dict[str, Any]]:
+    yt_opts: Dict[str, Any] = {
+        "verbose": False,
+        "quiet": True,
+        "debug_printtraffic": debug,
+        "extract_flat": "in_playlist",
+        "lazy_playlist": True,
+    }
+
+    Trace.info(f"expand '{url}'")
+
+    count = 0
+    try:
+        with yt_dlp.YoutubeDL(yt_opts) as ydl:
+            for entry in iter_entries(ydl, url, 0):
+                count += 1
+                yield entry
+
+    except DownloadError as err:
+        error = Color.clear(str(err)).replace("ERROR: ", "")
+        Trace.error(f"expand '{url}': {error}")
+
+    Trace.info(f"expand '{url}': {count} video(s)")
+
+def iter_entries(ydl: yt_dlp.YoutubeDL, url: str, depth: int) -> Generator[Dict[str, Any]]:
+
+    # process=False -> 'entries' is a generator, the next page is fetched when needed
+
+    result = ydl.extract_info(url, download=False, process=False)
+    if result is None:
+        return
+
+    # 'url', 'url_transparent' -> not resolved with process=False, e.g. redirect to the channel or a single video
+
+    if result.get("_type") in {"url", "url_transparent"}:
+        if result.get("ie_key") == "Youtube" and result.get("id"):
+            yield result
+        elif depth < MAX_DEPTH and result.get("url"):
+            yield from iter_entries(ydl, result["url"], depth + 1)
+        return
+
+    for entry in result.get("entries") or []:
+        if entry is None:
+            continue
+
+        if entry.get("ie_key") == "Youtube" or entry.get("_type", "video") == "video":
+            if entry.get("id"):
+                yield entry
+
+        elif depth < MAX_DEPTH and entry.get("url"):
+            yield from iter_entries(ydl, entry["url"], depth + 1)
+
+# mixed list of video ids and collection urls -> video ids
+
+def iter_ids(values: Iterable[str], debug: bool = False) -> Generator[str]:
+    for value in values:
+        if is_collection_url(value):
+            for entry in expand_url(value, debug):
+                yield str(entry["id"])
+        else:
+            yield value
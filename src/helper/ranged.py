@@ -0,0 +1,252 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 14:05
+
+    src/helper/ranged.py
+
+    parallel range request download of a single https format (filesize known)
+     - preallocated '<file>.part', chunks are written in place at their offset
+     - n connections per file, retry per chunk (resumes inside the chunk)
+     - finished chunks are noted in '<file>.part.ranges' -> an interrupted download continues after a restart
+     - http 403 / 410 (signed url expired): no retry -> False, the caller extracts again
+     - http 200 instead of 206 (server ignores 'Range'): one stream from the start
+
+    PUBLIC:
+     - download_ranged(url: str, filepath: Path | str, filesize: int, *, headers: Dict[str, str] | None = None, connections: int = 4, chunk_size: int = 10485760, retries: int = 5, progress: Callable[[int], None] | None = None, throttle: Callable[[int], None] | None = None) -> bool
+
+     - remove_partial(filepath: Path | str) -> None
+
+    PRIVATE:
+     - load_journal(state: Dict[str, Any]) -> Set[int]
+     - write_journal(state: Dict[str, Any]) -> None
+     - split_chunks(filesize: int, chunk_size: int) -> List[Tuple[int, int]]
+     - download_chunk(state: Dict[str, Any], start: int, end: int) -> None
+     - download_single(state: Dict[str, Any]) -> None
+     - add_block(state: Dict[str, Any], size: int) -> None
+     - retry(state: Dict[str, Any], err: Exception, attempt: int, name: str) -> None
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Set, Tuple
+
+# utils
+from src.utils.trace import Trace
+
+JOURNAL_SUFFIX = ".part.ranges"
+
+BLOCK_SIZE = 256 * 1024
+TIMEOUT    = 30 # sec
+
+FATAL_STATUS = (403, 410) # signed url expired -> a retry cannot succeed
+
+def download_ranged(url: str, filepath: Path | str, filesize: int, *, headers: Dict[str, str] | None = None, connections: int = 4, chunk_size: int = 10485760, retries: int = 5, progress: Callable[[int], None] | None = None, throttle: Callable[[int], None] | None = None) -> bool:
+    filepath = Path(filepath)
+    part_path = filepath.with_name(filepath.name + ".part")
+
+    chunks = split_chunks(filesize, chunk_size)
+
+    state: Dict[str, Any] = {
+        "url":          url,
+        "headers":      headers or {},
+        "part_path":    part_path,
+        "journal_path": filepath.with_name(filepath.name + JOURNAL_SUFFIX),
+        "filesize":     filesize,
+        "chunk_size":   chunk_size,
+        "done":         set(),
+        "retries":      retries,
+        "progress":     progress,
+        "throttle":     throttle,
+        "downloaded":   0,
+        "lock":         threading.Lock(),
+        "abort":        threading.Event(),
+        "single":       False, # http 200 for a range request
+    }
+
+    # interrupted run (crash, restart) -> continue with the missing chunks
+
+    state["done"] = load_journal(state)
+    if len(state["done"]) > 0:
+        state["downloaded"] = sum(end - start + 1 for start, end in chunks if start in state["done"])
+        Trace.info(f"resume '{filepath.name}': {len(state['done'])}/{len(chunks)} chunk(s), {state['downloaded'] / 1024 / 1024:.1f} MB")
+    else:
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        with part_path.open(mode="wb") as f:
+            f.truncate(filesize)
+        write_journal(state)
+
+    start_time = time.time()
+    with ThreadPoolExecutor(max_workers=max(1, connections), thread_name_prefix="range") as executor:
+        futures = [executor.submit(download_chunk, state, start, end) for start, end in chunks if start not in state["done"]]
+
+        error = None
+        for future in futures:
+            try:
+                future.result()
+            except (OSError, HTTPException, ValueError) as err:
+                state["abort"].set()
+                error = err
+
+    if error is None and state["single"]:
+        Trace.warning(f"'{filepath.name}': server ignores 'Range' (http 200) -> single stream")
+        try:
+            download_single(state)
+        except (OSError, HTTPException, ValueError) as err:
+            error = err
+
+    if error is not None:
+        Trace.error(f"ranged download failed '{filepath.name}': {error}")
+        remove_partial(filepath) # preallocated -> must not be resumed by another downloader
+        return False
+
+    part_path.replace(filepath)
+    state["journal_path"].unlink(missing_ok=True)
+
+    duration = max(time.time() - start_time, 0.001)
+    Trace.result(f"ranged download '{filepath.name}' - {len(chunks)} chunk(s) - {filesize / duration / 1024 / 1024:.2f} MB/sec")
+    return True
+
+# preallocated '.part' of an interrupted ranged download -> remove (before another downloader starts)
+
+def remove_partial(filepath: Path | str) -> None:
+    filepath = Path(filepath)
+    journal_path = filepath.with_name(filepath.name + JOURNAL_SUFFIX)
+
+    if journal_path.exists():
+        filepath.with_name(filepath.name + ".part").unlink(missing_ok=True)
+        journal_path.unlink(missing_ok=True)
+
+# '<file>.part.ranges': {"filesize": ..., "chunk_size": ..., "done": [start, ...]}
+#  - valid only for the same filesize, chunk size and a complete preallocated '.part'
+
+def load_journal(state: Dict[str, Any]) -> Set[int]:
+    try:
+        journal = json.loads(state["journal_path"].read_text(encoding="utf-8"))
+        if journal["filesize"] != state["filesize"] or journal["chunk_size"] != state["chunk_size"]:
+            return set()
+        if state["part_path"].stat().st_size != state["filesize"]:
+            return set()
+        return {int(start) for start in journal["done"]}
+
+    except (OSError, ValueError, KeyError, TypeError):
+        return set()
+
+# written after each chunk (lock held by the caller) -> atomic replace
+
+def write_journal(state: Dict[str, Any]) -> None:
+    journal = {
+        "filesize":   state["filesize"],
+        "chunk_size": state["chunk_size"],
+        "done":       sorted(state["done"]),
+    }
+
+    temp_path = state["journal_path"].with_name(state["journal_path"].name + ".tmp")
+    temp_path.write_text(json.dumps(journal), encoding="utf-8")
+    temp_path.replace(state["journal_path"])
+
+# [(0, 10485759), (10485760, 20971519), ...] -> inclusive ranges (http 'Range: bytes=start-end')
+
+def split_chunks(filesize: int, chunk_size: int) -> List[Tuple[int, int]]:
+    chunk_size = max(1, chunk_size)
+    return [(start, min(start + chunk_size, filesize) - 1) for start in range(0, filesize, chunk_size)]
+
+def download_chunk(state: Dict[str, Any], start: int, end: int) -> None:
+    position = start
+    attempt = 0
+
+    while True:
+        if state["abort"].is_set():
+            return
+
+        request = urllib.request.Request(state["url"], headers={**state["headers"], "Range": f"bytes={position}-{end}"})  # noqa: S310
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response, state["part_path"].open(mode="r+b") as f:  # noqa: S310
+                if response.status == 200:
+                    state["single"] = True
+                    state["abort"].set()
+                    return
+
+                if response.status != 206:
+                    msg = f"range not supported (http {response.status})"
+                    raise ValueError(msg)
+
+                f.seek(position)
+                while position <= end:
+                    if state["abort"].is_set():
+                        return
+
+                    block = response.read(min(BLOCK_SIZE, end - position + 1))
+                    if not block:
+                        msg = f"connection closed at {position} (chunk {start}-{end})"
+                        raise urllib.error.URLError(msg)
+
+                    f.write(block)
+                    position += len(block)
+                    add_block(state, len(block))
+
+            with state["lock"]:
+                state["done"].add(start)
+                write_journal(state)
+            return
+
+        except (OSError, HTTPException) as err:
+            attempt += 1
+            retry(state, err, attempt, f"chunk {start}-{end}")
+
+# server without range support -> whole file in one stream, a retry starts again at 0
+
+def download_single(state: Dict[str, Any]) -> None:
+    attempt = 0
+
+    while True:
+        with state["lock"]:
+            state["downloaded"] = 0
+
+        request = urllib.request.Request(state["url"], headers=state["headers"])  # noqa: S310
+        try:
+            with urllib.request.urlopen(request, timeout=TIMEOUT) as response, state["part_path"].open(mode="r+b") as f:  # noqa: S310
+                position = 0
+                while position < state["filesize"]:
+                    block = response.read(min(BLOCK_SIZE, state["filesize"] - position))
+                    if not block:
+                        msg = f"connection closed at {position}"
+                        raise urllib.error.URLError(msg)
+
+                    f.write(block)
+                    position += len(block)
+                    add_block(state, len(block))
+            return
+
+        except (OSError, HTTPException) as err:
+            attempt += 1
+            retry(state, err, attempt, "single stream")
+
+def add_block(state: Dict[str, Any], size: int) -> None:
+    if state["throttle"] is not None:
+        state["throttle"](size)
+
+    with state["lock"]:
+        state["downloaded"] += size
+        downloaded = state["downloaded"]
+
+    if state["progress"] is not None:
+        state["progress"](downloaded)
+
+# failed request -> raise (expired url, too many attempts) or wait for the next attempt
+
+def retry(state: Dict[str, Any], err: Exception, attempt: int, name: str) -> None:
+    if isinstance(err, urllib.error.HTTPError) and err.code in FATAL_STATUS:
+        raise err
+
+    if attempt > state["retries"]:
+        raise err
+
+    Trace.warning(f"{name}: {err} -> retry {attempt}/{state['retries']}")
+    time.sleep(min(2 ** attempt, 30))
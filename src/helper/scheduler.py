@@ -0,0 +1,231 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 15:10
+
+    src/helper/scheduler.py
+
+    asyncio orchestration of download jobs
+     - jobs are taken from the (lazy) source while the first downloads are running
+     - metadata (latency bound)   -> metadata_workers parallel requests
+     - transfer (bandwidth bound) -> transfer_workers parallel downloads
+     - per edge host ('*.googlevideo.com') max. host_limit parallel downloads
+     - waiting downloads ordered by estimated size (settings.yaml 'schedule.order') + disk space preflight
+     - watchdog: download step in a supervised worker process (src/helper/watchdog.py)
+     - adaptive: metadata/transfer limits are set by an AIMD controller (src/helper/adaptive.py)
+     - blocking yt-dlp calls run in a thread pool
+
+    PUBLIC:
+     - schedule_jobs(jobs: Iterable[Job], path: Path, debug: bool = False, *, metadata_workers: int = 2, transfer_workers: int = 2, host_limit: int = 2, adaptive: bool = False, ahead: int = 0) -> None
+     - create_limits(executor: ThreadPoolExecutor, metadata_workers: int, transfer_workers: int, host_limit: int, adaptive: bool = False) -> Dict[str, Any]
+     - run_job(job: Job, path: Path, debug: bool, limits: Dict[str, Any]) -> None
+
+    PRIVATE:
+     - transfer_priority(order: str, size: int) -> float
+     - reserve_disk(limits: Dict[str, Any], path: Path, job: Job, plan: Dict[str, Any]) -> bool
+     - run_blocking(limits: Dict[str, Any], job: Job, func: Callable[..., Any], *args: Any) -> Any
+     - host_semaphores(limits: Dict[str, Any], hosts: List[str]) -> List[asyncio.Semaphore]
+"""
+from __future__ import annotations
+
+import asyncio
+import shutil
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Set, Tuple
+
+# helper
+from src.helper.adaptive import AdaptiveLimit, Controller
+from src.helper.bandwidth import parse_size
+from src.helper.watchdog import fetch_media_isolated
+from src.helper.youtube import fetch_media, fetch_metadata, format_hosts
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from src.helper.job import Job
+
+EDGE_DOMAIN = "googlevideo.com"
+
+async def schedule_jobs(jobs: Iterable[Job], path: Path, debug: bool = False, *, metadata_workers: int = 2, transfer_workers: int = 2, host_limit: int = 2, adaptive: bool = False, ahead: int = 0) -> None:
+    metadata_workers = max(1, metadata_workers)
+    transfer_workers = max(1, transfer_workers)
+
+    with ThreadPoolExecutor(max_workers=metadata_workers + transfer_workers, thread_name_prefix="yt-dlp") as executor:
+        limits = create_limits(executor, metadata_workers, transfer_workers, host_limit, adaptive)
+
+        # jobs may come from a lazy source (playlist, channel) -> next() runs in the pool,
+        # at most 'pending' jobs are started ahead of the running ones
+        #  - ahead: jobs in progress (0 -> 2 x (metadata_workers + transfer_workers)), e.g. worker: one lookahead window
+
+        pending = asyncio.Semaphore(ahead if ahead > 0 else 2 * (metadata_workers + transfer_workers))
+        tasks: Set[asyncio.Task[None]] = set()
+
+        loop = asyncio.get_running_loop()
+        iterator = iter(jobs)
+        while True:
+            await pending.acquire()
+
+            job = await loop.run_in_executor(executor, next, iterator, None)
+            if job is None:
+                pending.release()
+                break
+
+            task = asyncio.create_task(run_job(job, path, debug, limits))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            task.add_done_callback(lambda _task: pending.release())
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+# must be called in the running event loop (semaphores)
+#  - adaptive: workers = maximum, start with 1 metadata request and 1 download (AIMD controller)
+
+def create_limits(executor: ThreadPoolExecutor, metadata_workers: int, transfer_workers: int, host_limit: int, adaptive: bool = False) -> Dict[str, Any]:
+    limits: Dict[str, Any] = {
+        "executor":   executor,
+        "metadata":   asyncio.Semaphore(metadata_workers),
+        "transfer":   AdaptiveLimit("transfer", transfer_workers, start=transfer_workers), # priority order
+
+        # waiting downloads: "fifo", "smallest" (shortest job first) or "largest" first
+        "order":      str(Prefs.get("schedule.order", "fifo")),
+
+        # disk space preflight: estimated bytes of the running downloads (job_id -> bytes)
+        "min_free":   parse_size(Prefs.get("schedule.min_free", 0)), # "1G" -> bytes
+        "reserved":   {},
+
+        # metadata must not run too far ahead of the transfers (signed urls expire)
+        "lookahead":  asyncio.Semaphore(metadata_workers + transfer_workers),
+
+        "host_limit": max(1, host_limit),
+        "hosts":      {},
+        "controller": None,
+
+        # download step in a supervised worker process (stall detection, time limit)
+        "isolated":   bool(Prefs.get("watchdog.enabled", False)),
+    }
+
+    if adaptive:
+        limits["metadata"]   = AdaptiveLimit("metadata", metadata_workers)
+        limits["transfer"]   = AdaptiveLimit("transfer", transfer_workers) # start with 1
+        limits["controller"] = Controller(limits["metadata"], limits["transfer"])
+
+    return limits
+
+async def run_job(job: Job, path: Path, debug: bool, limits: Dict[str, Any]) -> None:
+    lookahead: asyncio.Semaphore = limits["lookahead"]
+    controller: Controller | None = limits["controller"]
+    waiting = True
+
+    await lookahead.acquire()
+    try:
+        async with limits["metadata"]:
+            plan = await run_blocking(limits, job, partial(fetch_metadata, job=job), job.youtube_id, path, job.audio_only, job.language, debug)
+
+        if controller is not None:
+            await controller.metadata_done(job, plan is not None)
+
+        if plan is None or plan["done"]:
+            if plan is None and job.state != "failed":
+                job.set_state("failed")
+            return
+
+        hosts = [host for host in format_hosts(plan["info"], plan["format"]) if host.endswith(EDGE_DOMAIN)]
+
+        async with AsyncExitStack() as stack:
+            await limits["transfer"].acquire(transfer_priority(limits["order"], plan["size"]))
+            stack.callback(limits["transfer"].release)
+
+            for semaphore in host_semaphores(limits, hosts):
+                await stack.enter_async_context(semaphore)
+
+            lookahead.release()
+            waiting = False
+
+            if not reserve_disk(limits, path, job, plan):
+                return
+            stack.callback(limits["reserved"].pop, job.job_id, None)
+
+            start_time = time.time()
+            if limits["isolated"]:
+                ret = await run_blocking(limits, job, fetch_media_isolated, plan, job, path, debug)
+            else:
+                ret = await run_blocking(limits, job, fetch_media, plan, job)
+
+        if controller is not None:
+            await controller.transfer_done(job, bool(ret), job.bytes, time.time() - start_time)
+
+        if not ret and job.state != "failed":
+            job.set_state("failed")
+
+    finally:
+        if waiting:
+            lookahead.release()
+
+# Trace.fatal raises SystemExit -> must not stop the other jobs
+
+async def run_blocking(limits: Dict[str, Any], job: Job, func: Callable[..., Any], *args: Any) -> Any:
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(limits["executor"], func, *args)
+    except (Exception, SystemExit) as err:  # noqa: BLE001 # one failed job (also Trace.fatal) -> the other jobs continue
+        if job.error == "":
+            job.error = str(err) or type(err).__name__
+        if not isinstance(err, SystemExit): # already reported by Trace.fatal
+            Trace.error(f"{job.youtube_id}: {job.error}")
+        return None
+
+# lower value -> earlier (unknown size: last for "smallest", first for "largest")
+
+def transfer_priority(order: str, size: int) -> float:
+    if order == "smallest":
+        return float(size) if size > 0 else float("inf")
+    if order == "largest":
+        return -float(size)
+    return 0.0 # fifo
+
+# free space - not yet written bytes of the running downloads - this download > min_free
+#  - merged formats: streams + merged file on disk at the same time -> 2 x size
+#  - unknown size -> no check
+
+def reserve_disk(limits: Dict[str, Any], path: Path, job: Job, plan: Dict[str, Any]) -> bool:
+    size = plan["size"] * (2 if "+" in plan["format"] else 1)
+    if size <= 0:
+        return True
+
+    try:
+        free = shutil.disk_usage(path).free
+    except OSError as err:
+        Trace.warning(f"disk space: {err} -> no check")
+        return True
+
+    reserved: Dict[str, Tuple[Job, int]] = limits["reserved"]
+    pending = sum(max(0, needed - other.bytes) for other, needed in reserved.values())
+
+    if free - pending - size < limits["min_free"]:
+        job.error = f"disk space: {size / 1024**3:.2f} GB needed, {(free - pending) / 1024**3:.2f} GB available (min_free {limits['min_free'] / 1024**3:.2f} GB)"
+        Trace.error(f"{job.youtube_id}: {job.error}")
+        job.set_state("failed")
+        return False
+
+    reserved[job.job_id] = (job, size)
+    return True
+
+# sorted host order -> no deadlock between jobs sharing two hosts
+
+def host_semaphores(limits: Dict[str, Any], hosts: List[str]) -> List[asyncio.Semaphore]:
+    semaphores: Dict[str, asyncio.Semaphore] = limits["hosts"]
+
+    result = []
+    for host in sorted(hosts):
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(limits["host_limit"])
+        result.append(semaphores[host])
+    return result
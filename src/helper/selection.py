@@ -0,0 +1,245 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 22:10
+
+    src/helper/selection.py
+
+    format selection policy (settings.yaml 'format'), compiled once per mode (normal, audio only)
+     - format table: one row per https video-only / audio-only format (normalized fields)
+     - hard constraints: codec list, max_height, max_fps, dynamic_range, drc
+     - score: tuple of the criteria in the configured order (lexicographic), e.g.
+         video: [quality, codec, height, fps, tbr]
+         audio: [quality, codec, channels, tbr]
+       codec / dynamic_range -> rank in the settings list (first = best)
+     - all_codecs (analyser): codecs not in the lists are kept, ranked last
+     - byte budget per item (format.budget): max_size (bytes) / max_bitrate (kbit/s)
+       -> best combination within the budget, nothing fits -> smallest combination
+
+    PUBLIC:
+     - format_size(format: Dict[str, Any], duration: float) -> int
+     - format_table(info: Dict[str, Any], protocols: Dict[str, int] | None = None) -> List[Dict[str, Any]]
+
+    class Policy:
+      - Policy(video_codecs: List[str], audio_codecs: List[str], settings: Dict[str, Any], all_codecs: bool = False)
+      - Policy.video_ok(row: Dict[str, Any]) -> bool
+      - Policy.audio_ok(row: Dict[str, Any]) -> bool
+      - Policy.video_key(row: Dict[str, Any]) -> Tuple[Any, ...]
+      - Policy.audio_key(row: Dict[str, Any]) -> Tuple[Any, ...]
+      - Policy.best_per_codec(rows: Iterable[Dict[str, Any]], kind: str) -> Dict[str, Dict[str, Any]]
+
+     - load_policy(audio_only: bool) -> Policy
+     - analyse_policy() -> Policy
+     - select_formats(info: Dict[str, Any], language: str, policy: Policy, max_size: float = 0, max_bitrate: float = 0) -> str | None
+
+    PRIVATE:
+     - compile_key(criteria: List[str], codec_rank: Dict[str, int], range_rank: Dict[str, int]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Tuple
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+VIDEO_ORDER = ["quality", "codec", "height", "fps", "tbr"]
+AUDIO_ORDER = ["quality", "codec", "channels", "tbr"]
+
+# filesize, filesize_approx or tbr (kbit/s) * duration -> bytes (0 = unknown)
+
+def format_size(format: Dict[str, Any], duration: float) -> int:
+    if format.get("filesize"):
+        return int(format["filesize"])
+    if format.get("filesize_approx"):
+        return int(format["filesize_approx"])
+    if format.get("tbr") and duration > 0:
+        return int(float(format["tbr"]) * 1000 / 8 * duration)
+    return 0
+
+# https video-only / audio-only formats -> rows (muxed formats, storyboards, m3u8 are skipped)
+#  - protocols: counts of the skipped audio / video formats of other protocols (e.g. {"m3u8_native": 13})
+
+def format_table(info: Dict[str, Any], protocols: Dict[str, int] | None = None) -> List[Dict[str, Any]]:
+    duration = float(info.get("duration") or 0)
+
+    rows = []
+    for format in info.get("formats") or []:
+        acodec = format.get("acodec") or "none"
+        vcodec = format.get("vcodec") or "none"
+
+        protocol = format.get("protocol")
+        if protocol != "https":
+            if protocols is not None and (acodec != "none" or vcodec != "none"):
+                protocols[str(protocol)] = protocols.get(str(protocol), 0) + 1
+            continue
+
+        if (acodec == "none") == (vcodec == "none"):
+            continue
+
+        video = vcodec != "none"
+        note  = format.get("format_note") or ""
+        rows.append({
+            "id":            format["format_id"],
+            "kind":          "video" if video else "audio",
+            "codec":         (vcodec if video else acodec).split(".")[0],
+            "quality":       float(format.get("quality") or 0),
+            "height":        int(format.get("height") or 0),
+            "fps":           float(format.get("fps") or 0),
+            "tbr":           float(format.get("tbr") or 0),
+            "dynamic_range": format.get("dynamic_range") or "SDR",
+            "channels":      int(format.get("audio_channels") or 0),
+            "drc":           "DRC" in note,
+            "language":      format.get("language") or "null",
+            "language_pref": -1 if format.get("language_preference") is None else int(format["language_preference"]),
+            "original":      "original" in note,
+            "size":          format_size(format, duration),
+        })
+
+    return rows
+
+class Policy:
+    def __init__(self, video_codecs: List[str], audio_codecs: List[str], settings: Dict[str, Any], all_codecs: bool = False) -> None:
+        self.all_codecs = all_codecs
+        self.video_rank = {codec: i for i, codec in enumerate(video_codecs)}
+        self.audio_rank = {codec: i for i, codec in enumerate(audio_codecs)}
+
+        dynamic_range = settings.get("dynamic_range") or []
+        self.range_rank = {value: i for i, value in enumerate(dynamic_range)}
+
+        self.max_height = int(settings.get("max_height") or 0)
+        self.max_fps    = float(settings.get("max_fps") or 0)
+        self.drc        = bool(settings.get("drc", False))
+
+        self.video_key = compile_key(settings.get("video_order") or VIDEO_ORDER, self.video_rank, self.range_rank)
+        self.audio_key = compile_key(settings.get("audio_order") or AUDIO_ORDER, self.audio_rank, self.range_rank)
+
+    def video_ok(self, row: Dict[str, Any]) -> bool:
+        return (
+            (self.all_codecs or row["codec"] in self.video_rank)
+            and (self.max_height == 0 or row["height"] <= self.max_height)
+            and (self.max_fps == 0 or row["fps"] <= self.max_fps)
+            and (len(self.range_rank) == 0 or row["dynamic_range"] in self.range_rank)
+        )
+
+    def audio_ok(self, row: Dict[str, Any]) -> bool:
+        return (self.all_codecs or row["codec"] in self.audio_rank) and (self.drc or not row["drc"])
+
+    # best row of each codec (within the constraints)
+
+    def best_per_codec(self, rows: Iterable[Dict[str, Any]], kind: str) -> Dict[str, Dict[str, Any]]:
+        ok, key = (self.video_ok, self.video_key) if kind == "video" else (self.audio_ok, self.audio_key)
+
+        best: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            if row["kind"] != kind or not ok(row):
+                continue
+            if row["codec"] not in best or key(row) > key(best[row["codec"]]):
+                best[row["codec"]] = row
+        return best
+
+# criteria names -> one key function (tuple, larger = better)
+
+def compile_key(criteria: List[str], codec_rank: Dict[str, int], range_rank: Dict[str, int]) -> Callable[[Dict[str, Any]], Tuple[Any, ...]]:
+    getters: List[Callable[[Dict[str, Any]], Any]] = []
+
+    for criterion in criteria:
+        if criterion == "codec":
+            getters.append(lambda row: -codec_rank.get(row["codec"], len(codec_rank)))
+        elif criterion == "dynamic_range":
+            getters.append(lambda row: -range_rank.get(row["dynamic_range"], len(range_rank)))
+        elif criterion == "drc":
+            getters.append(lambda row: not row["drc"])
+        elif criterion in {"quality", "height", "fps", "tbr", "channels"}:
+            getters.append(lambda row, name=criterion: row[name])  # type: ignore[misc]
+        else:
+            Trace.error(f"format policy: unknown criterion '{criterion}' -> ignored")
+
+    return lambda row: tuple(getter(row) for getter in getters)
+
+# compiled once per mode (normal, audio only, analyse)
+
+policies: Dict[bool | str, Policy] = {}
+
+def load_policy(audio_only: bool) -> Policy:
+    if audio_only not in policies:
+        if audio_only:
+            video_codecs = []
+            audio_codecs = Prefs.get("format.audio_only.audio_codecs")
+        else:
+            video_codecs = Prefs.get("format.normal.video_codecs")
+            audio_codecs = Prefs.get("format.normal.audio_codecs")
+
+        policies[audio_only] = Policy(video_codecs, audio_codecs, Prefs.get("format.policy", {}) or {})
+
+    return policies[audio_only]
+
+# analyser: every available codec (e.g. ac-3, ec-3 also for video downloads), ranks of normal + audio only
+
+def analyse_policy() -> Policy:
+    if "analyse" not in policies:
+        video_codecs = list(Prefs.get("format.normal.video_codecs") or [])
+        audio_codecs = list(Prefs.get("format.normal.audio_codecs") or [])
+        audio_codecs += [codec for codec in Prefs.get("format.audio_only.audio_codecs") or [] if codec not in audio_codecs]
+
+        policies["analyse"] = Policy(video_codecs, audio_codecs, Prefs.get("format.policy", {}) or {}, all_codecs=True)
+
+    return policies["analyse"]
+
+# -> "<video id>+<audio id>", "<audio id>" (audio only) or None (no matching format)
+
+def select_formats(info: Dict[str, Any], language: str, policy: Policy, max_size: float = 0, max_bitrate: float = 0) -> str | None:
+    table = format_table(info)
+
+    audios = [row for row in table if row["kind"] == "audio" and row["language"] == language and policy.audio_ok(row)]
+    videos = [row for row in table if row["kind"] == "video" and policy.video_ok(row)]
+
+    if len(audios) == 0 or (len(policy.video_rank) > 0 and len(videos) == 0):
+        return None
+
+    if len(policy.video_rank) == 0:
+        videos = [{}] # audio only
+
+    def format_id(video: Dict[str, Any], audio: Dict[str, Any]) -> str:
+        return f"{video['id']}+{audio['id']}" if video else str(audio["id"])
+
+    if max_size <= 0 and max_bitrate <= 0:
+        audio = max(audios, key=policy.audio_key)
+        video = max(videos, key=policy.video_key) if videos[0] else {}
+        return format_id(video, audio)
+
+    # byte budget: all combinations
+
+    best: Tuple[Any, ...] | None = None
+    best_format = ""
+    smallest = (float("inf"), "")
+
+    for video in videos:
+        video_key = policy.video_key(video) if video else ()
+        for audio in audios:
+            size    = video.get("size", 0) + audio["size"]
+            bitrate = video.get("tbr", 0) + audio["tbr"]
+
+            if 0 < size < smallest[0]:
+                smallest = (size, format_id(video, audio))
+
+            if max_size > 0 and (size == 0 or size > max_size):
+                continue
+            if max_bitrate > 0 and (bitrate == 0 or bitrate > max_bitrate):
+                continue
+
+            score = (video_key, policy.audio_key(audio), -size)
+            if best is None or score > best:
+                best = score
+                best_format = format_id(video, audio)
+
+    if best is None:
+        if smallest[1] == "":
+            return None
+
+        Trace.warning(f"budget: nothing fits (max_size {max_size / 1024 / 1024:.0f} MB, max_bitrate {max_bitrate:.0f} kbit/s) -> smallest '{smallest[1]}' {smallest[0] / 1024 / 1024:.1f} MB")
+        return smallest[1]
+
+    Trace.info(f"budget: '{best_format}' {-best[-1] / 1024 / 1024:.1f} MB")
+    return best_format
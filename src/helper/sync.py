@@ -0,0 +1,145 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 17:30
+
+    src/helper/sync.py
+
+    incremental channel sync
+     - per channel the newest synced upload (id + timestamp) is stored in the archive
+     - the channel is listed page by page (newest first), the listing stops at known content
+       -> a daily sync costs one or two requests per channel instead of a full listing
+     - marker is moved only up to the first failed download -> failed videos are retried next time
+
+    PUBLIC:
+     - normalize_channel_url(url: str) -> str
+     - sync_channels(urls: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, limit: int = 0) -> List[Job]
+
+    PRIVATE:
+     - new_entries(archive: Archive, url: str, limit: int, debug: bool) -> Generator[Dict[str, Any]]
+     - update_marker(archive: Archive, url: str, entries: List[Dict[str, Any]], jobs: Dict[str, Job]) -> None
+"""
+from __future__ import annotations
+
+import re
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Generator, List
+
+# helper
+from src.helper.archive import Archive
+from src.helper.batch import run_batch
+from src.helper.playlist import expand_url
+
+# utils
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.helper.job import Job
+
+# only the 'videos' tab is sorted by upload date
+CHANNEL_ROOT_PATTERN = re.compile(r"^(https?://(www\.)?youtube\.com/(@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+))/?$")
+
+KNOWN_LIMIT = 3 # consecutive entries already in the archive -> stop (first sync of a filled archive, marker video deleted or private)
+
+def normalize_channel_url(url: str) -> str:
+    url = url.strip()
+    if not url.startswith("http"):
+        url = "https://www.youtube.com/" + url.lstrip("/") # '@handle'
+
+    match = CHANNEL_ROOT_PATTERN.match(url)
+    if match:
+        return match.group(1) + "/videos"
+    return url
+
+def sync_channels(urls: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, limit: int = 0) -> List[Job]:
+    path = Path(path)
+    archive = Archive.open(path)
+
+    channels: Dict[str, List[Dict[str, Any]]] = {} # url -> new entries (newest first)
+
+    # all channels feed one batch -> downloads of the first channel run while the next one is listed
+
+    def create_ids() -> Generator[str]:
+        for url in urls:
+            channel_url = normalize_channel_url(url)
+            if channel_url in channels:
+                continue
+
+            entries = channels[channel_url] = []
+            for entry in new_entries(archive, channel_url, limit, debug):
+                entries.append(entry)
+                yield str(entry["id"])
+
+            Trace.info(f"sync '{channel_url}': {len(entries)} new video(s)")
+
+    jobs = run_batch(create_ids(), path, audio_only, force_language, debug, workers=workers, metadata_workers=metadata_workers, host_limit=host_limit)
+
+    jobs_by_id = {job.youtube_id: job for job in jobs}
+    for url, entries in channels.items():
+        update_marker(archive, url, entries, jobs_by_id)
+
+    return jobs
+
+# flat entries newer than the stored marker - closing the generator stops the pagination
+
+def new_entries(archive: Archive, url: str, limit: int, debug: bool) -> Generator[Dict[str, Any]]:
+    marker = archive.get_channel(url)
+    if marker is None:
+        Trace.info(f"sync '{url}': first sync" + (f" (max. {limit} videos)" if limit > 0 else ""))
+
+    count = 0
+    known = 0
+
+    for entry in expand_url(url, debug):
+        if marker is not None:
+            if entry["id"] == marker["newest_id"]:
+                break
+
+            timestamp = entry.get("timestamp")
+            if timestamp and marker["newest_timestamp"] > 0 and float(timestamp) <= marker["newest_timestamp"]:
+                break
+
+        if archive.get(entry["id"]) is not None:
+            known += 1
+            if known >= KNOWN_LIMIT:
+                break
+            continue # e.g. downloaded before a failed one (marker was not moved)
+        known = 0
+
+        yield entry
+
+        count += 1
+        if marker is None and limit > 0 and count >= limit:
+            break
+
+def update_marker(archive: Archive, url: str, entries: List[Dict[str, Any]], jobs: Dict[str, Job]) -> None:
+    if len(entries) == 0:
+        Trace.info(f"sync '{url}': up to date")
+        return
+
+    # newest entry without a failed download after it (list is newest first)
+    #  - entry without a job (e.g. same video in two channels, skipped as duplicate): done if it is in the archive
+
+    start  = 0
+    failed = 0
+    for i, entry in enumerate(entries):
+        job = jobs.get(entry["id"])
+        done = (job is not None and job.state == "done") or archive.get(entry["id"]) is not None
+        if not done:
+            start = i + 1
+            failed += 1
+
+    if start >= len(entries):
+        Trace.warning(f"sync '{url}': oldest new video failed -> marker unchanged")
+        return
+
+    entry = entries[start]
+    job = jobs.get(entry["id"])
+
+    timestamp = job.timestamp if job is not None and job.timestamp else float(entry.get("timestamp") or 0)
+    archive.set_channel(url, entry["id"], timestamp)
+
+    if failed > 0:
+        Trace.warning(f"sync '{url}': {failed} video(s) failed -> retry with the next sync")
+    Trace.result(f"sync '{url}': marker -> {entry['id']}")
@@ -0,0 +1,162 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 21:15
+
+    src/helper/watchdog.py
+
+    download step (step 2) in a supervised worker process -> settings.yaml 'watchdog.enabled: true'
+     - stall:      no new bytes for 'watchdog.stall_timeout' sec (not while merging)
+     - time limit: 'watchdog.time_limit' sec wall clock per attempt (0 = no limit)
+     - stuck process -> killed, the job is started again (max. 'watchdog.attempts'),
+       the next attempt continues the '.part' files
+     - the worker gets the info json of step 1 -> no second extraction
+
+    note: each worker process has its own token bucket -> use 'bandwidth.shared_file' for a global limit
+
+    PUBLIC:
+     - fetch_media_isolated(plan: Dict[str, Any], job: Job, path: Path, debug: bool) -> bool
+
+    PRIVATE:
+     - run_worker(job: Job, kwargs: Dict[str, Any], stall_timeout: float, time_limit: float) -> str
+     - apply_message(job: Job, message: Dict[str, Any]) -> None
+     - worker_main(queue: Any, prefs: Dict[str, Any], trace: Dict[str, Any], *, youtube_id: str, path: Path, audio_only: bool, language: str, debug: bool, info: Dict[str, Any]) -> None
+"""
+from __future__ import annotations
+
+import multiprocessing
+import queue as queue_module
+import time
+
+from typing import TYPE_CHECKING, Any, Dict
+
+import yt_dlp  # type: ignore[import-untyped]
+
+# helper
+from src.helper.job import Job
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+POLL     = 1.0 # sec
+INTERVAL = 0.5 # sec between two progress messages of the worker
+
+def fetch_media_isolated(plan: Dict[str, Any], job: Job, path: Path, debug: bool) -> bool:
+    stall_timeout = float(Prefs.get("watchdog.stall_timeout"))
+    time_limit    = float(Prefs.get("watchdog.time_limit"))
+    attempts      = max(1, int(Prefs.get("watchdog.attempts")))
+
+    info = yt_dlp.YoutubeDL.sanitize_info(plan["info"]) # picklable
+    kwargs = {"youtube_id": plan["youtube_id"], "path": path, "audio_only": job.audio_only, "language": job.language, "debug": debug, "info": info}
+
+    job.set_state("downloading")
+
+    reason = ""
+    for attempt in range(1, attempts + 1):
+        reason = run_worker(job, kwargs, stall_timeout, time_limit)
+        if reason in {"done", "failed"}:
+            return reason == "done"
+
+        Trace.warning(f"watchdog '{job.youtube_id}': {reason} -> killed (attempt {attempt}/{attempts})")
+
+    job.error = f"watchdog: {reason} ({attempts} attempts)"
+    job.set_state("failed")
+    return False
+
+# -> "done", "failed" (reported by the worker), "stalled", "time limit", "crashed"
+
+def run_worker(job: Job, kwargs: Dict[str, Any], stall_timeout: float, time_limit: float) -> str:
+    context = multiprocessing.get_context("spawn") # no fork of a process with threads
+    messages = context.Queue()
+
+    process = context.Process(target=worker_main, args=(messages, Prefs.get_all(), dict(Trace.settings)), kwargs=kwargs, daemon=True)
+    process.start()
+
+    start_time = last_progress = time.time()
+    last_bytes = -1
+    state = "downloading"
+
+    result = ""
+    while result == "":
+        try:
+            message = messages.get(timeout=POLL)
+        except queue_module.Empty:
+            message = None
+
+        now = time.time()
+        if message is not None:
+            apply_message(job, message)
+
+            if message["bytes"] != last_bytes or message["state"] != state:
+                last_progress = now
+                last_bytes = message["bytes"]
+                state = message["state"]
+
+            if state in {"done", "failed"}:
+                result = state
+                break
+
+        if not process.is_alive() and messages.empty():
+            result = "crashed"
+        elif state != "merging" and stall_timeout > 0 and now - last_progress > stall_timeout:
+            result = "stalled"
+        elif time_limit > 0 and now - start_time > time_limit:
+            result = "time limit"
+
+    if result in {"done", "failed"}:
+        process.join(timeout=10)
+
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+    messages.close()
+    return result
+
+# worker job state -> supervisor job (the supervisor job keeps its listeners: queue, report)
+
+def apply_message(job: Job, message: Dict[str, Any]) -> None:
+    for key in ("title", "channel", "format", "filepath", "error", "timestamp"):
+        if message[key]:
+            setattr(job, key, message[key])
+
+    for filename, size in message["streams"].items():
+        job.add_bytes(filename, size)
+
+    if message["state"] in {"merging", "done", "failed"} and job.state != message["state"]:
+        job.set_state(message["state"])
+
+# worker process (spawn): prefs and trace settings of the supervisor, messages at most every INTERVAL sec
+
+def worker_main(queue: Any, prefs: Dict[str, Any], trace: Dict[str, Any], *, youtube_id: str, path: Path, audio_only: bool, language: str, debug: bool, info: Dict[str, Any]) -> None:
+    from src.helper.youtube import download_video  # noqa: PLC0415 # only in the worker process
+
+    Prefs.data = prefs
+    Trace.set(**trace)
+
+    job = Job(youtube_id, audio_only, language)
+    last_message = 0.0
+
+    def send(job: Job) -> None:
+        nonlocal last_message
+
+        now = time.time()
+        if job.state not in {"merging", "done", "failed"} and now - last_message < INTERVAL:
+            return
+        last_message = now
+
+        message = job.as_dict()
+        queue.put(message)
+
+    job.listeners.append(send)
+
+    try:
+        download_video(youtube_id, path, audio_only, language, debug, job=job, info=info)
+    except SystemExit: # Trace.fatal
+        if job.state != "failed":
+            job.set_state("failed")
+
+    if job.state not in {"done", "failed"}:
+        job.set_state("failed")
@@ -0,0 +1,101 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 20:00
+
+    src/helper/worker.py
+
+    worker mode: several hosts share the output tree (e.g. NFS) and its job queue (<dest>/jobs.sqlite)
+     - enqueue: jobs are only added to the queue
+     - worker:  claims jobs with a lease, extends the leases while running (heartbeat)
+                -> a dead worker's jobs are claimed again after 'queue.lease' sec
+
+    PUBLIC:
+     - enqueue_ids(youtube_ids: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False) -> int
+     - run_worker(path: Path | str, debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, follow: bool = False, adaptive: bool = False) -> List[Job]
+
+    PRIVATE:
+     - heartbeat(queue: JobQueue, lease: float, interval: float, stop: threading.Event) -> None
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Generator, List
+
+# helper
+from src.helper.batch import report_job
+from src.helper.job import Job
+from src.helper.jobqueue import JobQueue, worker_id
+from src.helper.playlist import iter_ids
+from src.helper.scheduler import schedule_jobs
+
+# utils
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+def enqueue_ids(youtube_ids: Iterable[str], path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False) -> int:
+    queue = JobQueue.open(path)
+
+    count = 0
+    for youtube_id in iter_ids(youtube_ids, debug):
+        queue.add(Job(youtube_id, audio_only, force_language), owned=False)
+        count += 1
+
+    Trace.result(f"queue: {count} job(s) added -> {queue.counts()}")
+    return count
+
+def run_worker(path: Path | str, debug: bool = False, *, workers: int = 1, metadata_workers: int = 2, host_limit: int = 2, follow: bool = False, adaptive: bool = False) -> List[Job]:
+    path = Path(path)
+    queue = JobQueue.open(path)
+
+    lease        = float(Prefs.get("queue.lease"))
+    interval     = float(Prefs.get("queue.heartbeat"))
+    max_attempts = int(Prefs.get("queue.max_attempts"))
+    poll         = float(Prefs.get("queue.poll"))
+
+    jobs: List[Job] = []
+
+    # claimed one by one, when the scheduler has room for the next job
+    #  - max. one lookahead window (metadata + downloads) -> no leases for jobs which idle hosts could run
+    #  - follow: wait for new jobs instead of stopping at an empty queue
+
+    def claim_jobs() -> Generator[Job]:
+        while True:
+            job = queue.claim(lease, max_attempts)
+            if job is None:
+                if not follow:
+                    return
+                time.sleep(poll)
+                continue
+
+            job.listeners.append(report_job)
+            jobs.append(job)
+            yield job
+
+    Trace.action(f"worker '{worker_id()}': {workers} download(s), {metadata_workers} metadata request(s), lease {lease:.0f} sec")
+
+    stop = threading.Event()
+    thread = threading.Thread(target=heartbeat, args=(queue, lease, interval, stop), name="heartbeat", daemon=True)
+    thread.start()
+
+    start_time = time.time()
+    try:
+        asyncio.run(schedule_jobs(claim_jobs(), path, debug, metadata_workers=metadata_workers, transfer_workers=workers, host_limit=host_limit, adaptive=adaptive, ahead=max(1, metadata_workers) + max(1, workers)))
+    finally:
+        stop.set()
+        thread.join()
+
+    Trace.result(f"worker '{worker_id()}': {len(jobs)} job(s) - {time.time() - start_time:.2f} sec - queue {queue.counts()}")
+    return jobs
+
+def heartbeat(queue: JobQueue, lease: float, interval: float, stop: threading.Event) -> None:
+    while not stop.wait(interval):
+        try:
+            queue.heartbeat(lease)
+        except Exception as err:  # noqa: BLE001 # e.g. database locked too long -> next heartbeat
+            Trace.error(f"heartbeat: {err}")
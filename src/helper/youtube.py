@@ -4,41 +4,89 @@
     src/helper/youtube.py
 
     PUBLIC:
-     - download_video(youtube_id: str, path: Path | str, audio_only: bool, debug: bool = False) -> bool
+     - download_video(youtube_id: str, path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, job: Job | None = None, info: Dict[str, Any] | None = None) -> bool
+     - fetch_metadata(youtube_id: str, path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, job: Job | None = None, info: Dict[str, Any] | None = None) -> Dict[str, Any] | None
+     - fetch_media(plan: Dict[str, Any], job: Job | None = None) -> bool
+     - format_hosts(info: Dict[str, Any], format: str) -> List[str]
+     - estimate_size(info: Dict[str, Any], format: str) -> int
+     - reset_selection(info: Dict[str, Any]) -> Dict[str, Any]
 
     PRIVATE:
+     - warm_ydl(yt_opts: Dict[str, Any]) -> yt_dlp.YoutubeDL
      - valid_filename_utf16( text: str ) -> str
+     - prefetch_formats(ydl: yt_dlp.YoutubeDL, yt_opts: Dict[str, Any], info: Dict[str, Any], job: Job | None) -> None
+     - fetch_format(yt_opts: Dict[str, Any], selected: Dict[str, Any], format: Dict[str, Any], format_path: str, *, connections: int, job: Job | None) -> None
+     - progress_hook(job: Job | None) -> Callable[[Dict[str, Any]], None]
+     - postprocessor_hook(job: Job | None) -> Callable[[Dict[str, Any]], None]
 """
 from __future__ import annotations
 
+import threading
 import time
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List
+from urllib.parse import urlparse
 
 import yt_dlp  # type: ignore[import-untyped]
 
-from yt_dlp.utils import DownloadError  # type: ignore[import-untyped]
+from yt_dlp.utils import DownloadError, prepend_extension, replace_extension  # type: ignore[import-untyped]
 
 # helper
 from src.helper.analyse import analyse_data
+from src.helper.archive import Archive
+from src.helper.bandwidth import Bandwidth, parse_size
+from src.helper.info_json import export_info_json, load_info_json
+from src.helper.ranged import download_ranged, remove_partial
+from src.helper.selection import format_size, load_policy, select_formats
 
 # utils
-from src.utils.file import export_json
 from src.utils.prefs import Prefs
 from src.utils.trace import Color, Trace
 
+if TYPE_CHECKING:
+    from src.helper.job import Job
+
 # https://github.com/ytdl-org/youtube-dl/blob/master/youtube_dl/YoutubeDL.py#L128-L278
 
-def download_video(youtube_id: str, path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False) -> bool:
+def download_video(youtube_id: str, path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, job: Job | None = None, info: Dict[str, Any] | None = None) -> bool:
+    plan = fetch_metadata(youtube_id, path, audio_only, force_language, debug, job=job, info=info)
+    if plan is None:
+        return False
+
+    if plan["done"]:
+        return True
+
+    return fetch_media(plan, job)
+
+# step 0 + step 1 -> plan (latency bound: page fetch, player-JS, format extraction)
+#  - {"done": True, ...} -> already downloaded
+
+def fetch_metadata(youtube_id: str, path: Path | str, audio_only: bool, force_language: str = "", debug: bool = False, *, job: Job | None = None, info: Dict[str, Any] | None = None) -> Dict[str, Any] | None:
     path = Path(path)
 
-    if audio_only:
-        audio_codecs = Prefs.get("format.audio_only.audio_codecs")
-        video_codecs = []
-    else:
-        audio_codecs = Prefs.get("format.normal.audio_codecs")
-        video_codecs = Prefs.get("format.normal.video_codecs")
+    # step 0: already downloaded? -> archive lookup, no network call
+
+    archive = Archive.open(path)
+    entry = archive.get(youtube_id)
+    if entry is not None:
+        if Path(entry["filepath"]).is_file():
+            Trace.info(f"already downloaded '{youtube_id}' -> '{entry["filepath"]}'")
+            if job is not None:
+                job.title    = entry["title"]
+                job.channel  = entry["channel"]
+                job.format   = entry["format"]
+                job.filepath = entry["filepath"]
+                job.set_state("done")
+            return { "done": True, "youtube_id": youtube_id, "filepath": entry["filepath"] }
+
+        Trace.warning(f"archive: file missing '{entry["filepath"]}' -> download again")
+        archive.remove(youtube_id)
+
+    if job is not None:
+        job.set_state("metadata")
 
     yt_opts: Dict[str, Any] = {
         "verbose": False,
@@ -55,21 +103,42 @@ def download_video(youtube_id: str, path: Path | str, audio_only: bool, force_la
         video_url = f"https://www.youtube.com/watch?v={youtube_id}"
 
         # step 1: metadata: title, ...
+        #  - info json sidecar of a previous run (signed format urls not expired) -> no extraction
+
+        if info is None and Prefs.get("info_json.reuse"):
+            sidecar = archive.get_info_json(youtube_id)
+            if sidecar is not None:
+                info = load_info_json(sidecar, Prefs.get("info_json.expire_margin"))
 
         start_time = time.time()
-        with yt_dlp.YoutubeDL(yt_opts) as ydl:
+        if info is not None:
+            Trace.info(f"reuse info json '{youtube_id}'")
+            info = reset_selection(info)
+            reused = True
+        else:
+            ydl = warm_ydl(yt_opts)
             Trace.info(f"get metadata '{youtube_id}'")
 
             info = ydl.extract_info(video_url, download=False)
             if info is None:
-                return False
+                return None
+            reused = False
 
-            title     = valid_filename_utf16(str(info["title"]))
-            channel   = valid_filename_utf16(str(info["channel"]))
-            timestamp = float(str(info["timestamp"]))
+        title     = valid_filename_utf16(str(info["title"]))
+        channel   = valid_filename_utf16(str(info["channel"]))
+        timestamp = float(str(info["timestamp"]))
 
-        data_info = ydl.sanitize_info(info)
-        export_json( path / channel, title + ".json", data_info, timestamp = timestamp ) # type: ignore[reportArgumentType] # -> ydl.sanitize_info(info)
+        if job is not None:
+            job.title     = title
+            job.channel   = channel
+            job.timestamp = timestamp
+
+        if not reused:
+            data_info = yt_dlp.YoutubeDL.sanitize_info(info)
+            sidecar_path = export_info_json( path / channel, title, data_info, timestamp ) # type: ignore[reportArgumentType] # -> ydl.sanitize_info(info)
+            archive.set_info_json(youtube_id, sidecar_path)
+
+            info = reset_selection(info) # step 2 selects again with 'format'
 
         available_tracks = analyse_data( info, title, force_language )
         skipped = available_tracks["languages_skipped"]
@@ -81,57 +150,104 @@ def download_video(youtube_id: str, path: Path | str, audio_only: bool, force_la
 
         # audio: mp4a, opus, ac-3, ec-3 (Enhanced AC-3)
         # video: av01 (H.265), vp9, avc1 (H.264)
+        #  -> compiled policy (settings.yaml 'format'), optional byte budget per item
 
-        audio_id = ""
-        video_id = ""
-        format = ""
+        policy = load_policy(audio_only)
 
-        quality_max = 0
-        for audio_codec in audio_codecs:
-            if audio_codec in available_tracks["audio"]:
-                quality = available_tracks["audio"][audio_codec][1]
-                if quality > quality_max:
-                    audio_id = available_tracks["audio"][audio_codec][0]
-                    quality_max = quality
+        max_size    = parse_size(Prefs.get("format.budget.max_size", 0))
+        max_bitrate = float(Prefs.get("format.budget.max_bitrate", 0))
 
-        if audio_id == "":
-            Trace.fatal(f"no audio codec matching {audio_codecs} <-> {available_tracks["audio"]}")
+        format = select_formats(info, available_tracks["language"], policy, max_size, max_bitrate) or ""
+        if format == "":
+            Trace.fatal(f"no format matching the policy <-> video {available_tracks["video"]}, audio {available_tracks["audio"]}")
 
-        if audio_only:
-            format = f"{audio_id}"
-        else:
-            quality_max = 0
-            for video_codec in video_codecs:
-                if video_codec in available_tracks["video"]:
-                    quality = available_tracks["video"][video_codec][1]
-                    if quality > quality_max:
-                        video_id = available_tracks["video"][video_codec][0]
-                        quality_max = quality
-
-            if video_id == "":
-                Trace.fatal(f"no video codec matching {video_codecs} <-> {available_tracks["video"]}")
-            else:
-                format = f"{video_id}+{audio_id}"
+        size = estimate_size(info, format)
 
+        yt_opts["format"] = format
         yt_opts["extract_audio"] = audio_only
         yt_opts["outtmpl"] = str(path) + f"/%(uploader)s/{title} ({format}).%(ext)s"
 
-        Trace.result( f"{time.time() - start_time:.2f} sec => '{title}' ({format})" )
+        yt_opts["progress_hooks"] = [progress_hook(job)]
+        yt_opts["postprocessor_hooks"] = [postprocessor_hook(job)]
+        if job is not None:
+            job.format = format
+            job.size   = size
+
+        Trace.result( f"{time.time() - start_time:.2f} sec => '{title}' ({format}) ~ {size / 1024 / 1024:.1f} MB" )
 
     except DownloadError as err:
         err_no_color = Color.clear(str(err))
         error = err_no_color.replace("ERROR: ", "")
+        if job is not None:
+            job.error = error
+            job.set_state("failed")
         Trace.fatal( f"{error}" )
-        return False
+        return None
+
+    return {
+        "done":       False,
+        "youtube_id": youtube_id,
+        "archive":    archive,
+        "info":       info,
+        "title":      title,
+        "channel":    channel,
+        "format":     format,
+        "size":       size,
+        "yt_opts":    yt_opts,
+    }
+
+# info dict for step 2: without the selection of step 1 ('requested_formats', 'requested_downloads', ...)
+#  -> otherwise an audio only 'format' (e.g. '251') keeps the video + audio formats of the default selection
+
+def reset_selection(info: Dict[str, Any]) -> Dict[str, Any]:
+    return yt_dlp.YoutubeDL.sanitize_info(info, remove_private_keys=True)
+
+# warm YoutubeDL for step 1, one per thread (YoutubeDL is not thread-safe)
+#  - extractor instances, player-JS cache and cookies are kept between the videos of a batch or the daemon
+#  - step 2 needs a new instance per video ('format' is compiled in YoutubeDL.__init__)
+
+warm = threading.local()
+
+def warm_ydl(yt_opts: Dict[str, Any]) -> yt_dlp.YoutubeDL:
+    instances: Dict[bool, yt_dlp.YoutubeDL] = warm.__dict__.setdefault("instances", {})
 
-    # step 2: audio/video download
+    debug = bool(yt_opts.get("debug_printtraffic"))
+    if debug not in instances:
+        instances[debug] = yt_dlp.YoutubeDL(dict(yt_opts))
+    return instances[debug]
+
+# step 2: audio/video download (bandwidth bound)
+#  - reuses 'info' from step 1 -> no second page fetch, player-JS handling and format extraction
+
+def fetch_media(plan: Dict[str, Any], job: Job | None = None) -> bool:
+    youtube_id = plan["youtube_id"]
+    archive    = plan["archive"]
+    info       = plan["info"]
+    title      = plan["title"]
+    channel    = plan["channel"]
+    format     = plan["format"]
+    yt_opts    = plan["yt_opts"]
 
     try:
+        if job is not None:
+            job.set_state("downloading")
+
         start_time = time.time()
         with yt_dlp.YoutubeDL(yt_opts) as ydl:
-            ydl.extract_info(video_url, download=True)
+            prefetch_formats(ydl, yt_opts, info, job)
+
+            result = ydl.process_ie_result(info, download=True)
 
         Trace.result( f"downloaded {time.time() - start_time:.2f} sec")
+
+        downloads = result.get("requested_downloads") or [{}]
+        filepath = downloads[0].get("filepath")
+        if filepath:
+            archive.add(youtube_id, channel, title, format, filepath)
+
+        if job is not None:
+            job.filepath = str(filepath or job.filepath)
+            job.set_state("done")
         return True
 
     except DownloadError as err:
@@ -139,8 +255,139 @@ def download_video(youtube_id: str, path: Path | str, audio_only: bool, force_la
         error = err_no_color.replace("ERROR: ", "")
 
         Trace.info(f"{error}")
+        if job is not None:
+            job.error = error
+            job.set_state("failed")
         return False
 
+# edge hosts of the selected formats, e.g. 'rr3---sn-4g5edn6r.googlevideo.com'
+
+def format_hosts(info: Dict[str, Any], format: str) -> List[str]:
+    format_ids = format.split("+")
+
+    hosts = set()
+    for entry in info.get("formats") or []:
+        if entry.get("format_id") in format_ids:
+            host = urlparse(entry.get("url", "")).hostname
+            if host:
+                hosts.add(host)
+
+    return sorted(hosts)
+
+# estimated bytes of the selected formats ('137+140'): filesize, filesize_approx or tbr (kbit/s) * duration
+
+def estimate_size(info: Dict[str, Any], format: str) -> int:
+    format_ids = format.split("+")
+    duration = float(info.get("duration") or 0)
+
+    return sum(format_size(entry, duration) for entry in info.get("formats") or [] if entry.get("format_id") in format_ids)
+
+# prefetch of the selected formats (video + audio at the same time)
+#  - https with known filesize -> ranged download (download.connections > 1), else yt-dlp downloader
+#  - same filenames as yt-dlp ('<name>.f<id>.<ext>' for merged formats)
+#  - yt-dlp finds the complete files, skips the transfer and merges as soon as both are there
+#  - one YoutubeDL per stream (YoutubeDL is not thread-safe)
+
+def prefetch_formats(ydl: yt_dlp.YoutubeDL, yt_opts: Dict[str, Any], info: Dict[str, Any], job: Job | None) -> None:
+    connections = Prefs.get("download.connections")
+
+    selected = ydl.process_ie_result(info, download=False)
+    formats = selected.get("requested_formats") or [selected]
+
+    filename = ydl.prepare_filename(selected)
+    if len(formats) == 1 and connections <= 1:
+        remove_partial(filename) # preallocated by an interrupted ranged download -> yt-dlp cannot continue it
+        return
+
+    with ThreadPoolExecutor(max_workers=len(formats), thread_name_prefix="stream") as executor:
+        futures = []
+        for format in formats:
+            if len(formats) > 1:
+                format_path = prepend_extension(replace_extension(filename, format["ext"]), f"f{format['format_id']}", format["ext"])
+            else:
+                format_path = filename
+
+            futures.append(executor.submit(fetch_format, yt_opts, selected, format, format_path, connections=connections, job=job))
+
+        for future in futures:
+            future.result()
+
+def fetch_format(yt_opts: Dict[str, Any], selected: Dict[str, Any], format: Dict[str, Any], format_path: str, *, connections: int, job: Job | None) -> None:
+    if Path(format_path).is_file():
+        return
+
+    start_time = time.time()
+    progress = partial(job.add_bytes, format_path) if job is not None else None
+
+    done = False
+    filesize = format.get("filesize")
+    if connections > 1 and format.get("protocol") == "https" and filesize and format.get("url"):
+        chunk_size = (format.get("downloader_options") or {}).get("http_chunk_size") or Prefs.get("download.chunk_size")
+
+        done = download_ranged(
+            format["url"],
+            format_path,
+            int(filesize),
+            headers     = format.get("http_headers"),
+            connections = connections,
+            chunk_size  = int(chunk_size),
+            retries     = Prefs.get("download.retries"),
+            progress    = progress,
+            throttle    = Bandwidth.consume,
+        )
+
+    if not done:
+        remove_partial(format_path) # preallocated by an interrupted ranged download -> yt-dlp cannot continue it
+
+        format_info = dict(selected)
+        format_info.pop("requested_formats", None)
+        format_info.update(format)
+
+        Path(format_path).parent.mkdir(parents=True, exist_ok=True)
+        with yt_dlp.YoutubeDL(yt_opts) as ydl:
+            done, _ = ydl.dl(format_path, format_info)
+
+    if done:
+        size = Path(format_path).stat().st_size
+        if job is not None:
+            job.add_bytes(format_path, size)
+
+        duration = max(time.time() - start_time, 0.001)
+        Trace.download(f"stream '{format['format_id']}' ({format.get('vcodec') if format.get('vcodec') != 'none' else format.get('acodec')}) - {size / 1024 / 1024:.1f} MB - {duration:.2f} sec - {size / duration / 1024 / 1024:.2f} MB/sec")
+
+# yt-dlp progress hook -> bytes per stream (video, audio), final filepath and global bandwidth limit
+#  - called after each block of the yt-dlp downloader -> sleeping here throttles the download
+
+def progress_hook(job: Job | None) -> Callable[[Dict[str, Any]], None]:
+    downloaded: Dict[str, int] = {}
+
+    def hook(status: Dict[str, Any]) -> None:
+        filename = str(status.get("filename", ""))
+
+        if status["status"] == "downloading":
+            current = int(status.get("downloaded_bytes") or 0)
+            Bandwidth.consume(current - downloaded.get(filename, current))
+            downloaded[filename] = current
+
+            if job is not None:
+                job.add_bytes(filename, current)
+
+        elif status["status"] == "finished" and job is not None:
+            total = status.get("total_bytes") or status.get("downloaded_bytes") or 0
+            job.add_bytes(filename, int(total))
+            job.filepath = filename
+
+    return hook
+
+# yt-dlp postprocessor hook -> job state 'merging' (video + audio -> mkv/mp4)
+
+def postprocessor_hook(job: Job | None) -> Callable[[Dict[str, Any]], None]:
+    def hook(status: Dict[str, Any]) -> None:
+        if job is not None and status["status"] == "started" and status.get("postprocessor") == "Merger":
+            job.set_state("merging")
+
+    return hook
+
 
 def valid_filename_utf16( text: str ) -> str:
 
@@ -7,44 +7,113 @@
     uv run src/main.py -id rU5mxh5tsI0
     uv run src/main.py -l de -id zqgbJq3T8Qo
     uv run src/main.py -a zqgbJq3T8Qo
+
+    uv run src/main.py -id rU5mxh5tsI0 -id zqgbJq3T8Qo -w 4
+    uv run src/main.py -f ids.txt -w 4
+    cat ids.txt | uv run src/main.py -f - -w 4
+
+    uv run src/main.py -r -w 4    # continue the interrupted batch (data/video/jobs.sqlite)
+    uv run src/main.py -r -a
+
+    uv run src/main.py -f ids.txt -w 8 -m 4 --adaptive
+
+    uv run src/main.py -q -f ids.txt   # only enqueue -> src/worker.py
+
+    uv run src/main.py -j "data/video/<channel>/<title>.json"
+    uv run src/main.py -j "data/video/<channel>/<title>.json.gz"
+
+    uv run src/main.py -id "https://www.youtube.com/playlist?list=<playlist id>" -w 4
+    uv run src/main.py -id "https://www.youtube.com/@<channel>/videos" -w 4
 """
 from __future__ import annotations
 
 import sys
 
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Tuple
+
 import click
 
 # helper
+from src.helper.batch import read_ids, report_batch, run_batch
+from src.helper.info_json import expand_info, is_info_valid
+from src.helper.playlist import is_collection_url, parse_video_id
+from src.helper.worker import enqueue_ids
 from src.helper.youtube import download_video
 
 # utils
+from src.utils.file import import_json
 from src.utils.globals import BASE_PATH
 from src.utils.prefs import Prefs
 from src.utils.trace import Trace
 
+if TYPE_CHECKING:
+    from io import TextIOWrapper
+
 DEST_VIDEO = BASE_PATH / "data" / "video"
 DEST_AUDIO = BASE_PATH / "data" / "audio"
 
-def validate_id(_ctx: click.Context, _param: click.Parameter, value: str) -> str:
-    if "?v=" in value:
-        value = value.split("?v=")[1][:11]
+def parse_id(value: str) -> str:
+    try:
+        return parse_video_id(value)
+    except ValueError as err:
+        raise click.BadParameter(str(err)) from err
 
-    if len(value) != 11:
-        msg = f"length = {len(value)} (should be 11)"
-        raise click.BadParameter(msg)
-    return value
+def validate_ids(_ctx: click.Context, _param: click.Parameter, values: Tuple[str, ...]) -> List[str]:
+    return [parse_id(value) for value in values]
 
 @click.command()
-@click.option("-id", "--youtube_id", callback=validate_id, prompt="Youtube ID (11 char)", help="Youtube ID - 11 characters")
+@click.option("-id", "--youtube_id", callback=validate_ids, multiple=True, help="Youtube ID - 11 characters, playlist or channel url (repeatable)")
+@click.option("-f",  "--id_file", type=click.File("r", encoding="utf-8"), help="file with Youtube IDs or urls - one per line ('-' = stdin)")
+@click.option("-j",  "--from_info_json", type=click.Path(exists=True, dir_okay=False, path_type=Path), help="info json sidecar of a previous run -> no extraction")
+@click.option("-w",  "--workers", type=click.IntRange(1, 32), default=1, help="batch: parallel downloads")
+@click.option("-m",  "--metadata_workers", type=click.IntRange(1, 32), default=2, help="batch: parallel metadata requests")
+@click.option("--host_limit", type=click.IntRange(1, 32), default=2, help="batch: parallel downloads per googlevideo edge host")
+@click.option("--adaptive", is_flag=True, help="adaptive concurrency (AIMD): batch: -w / -m are the maximum")
+@click.option("-q",  "--enqueue", is_flag=True, help="only add the jobs to the queue -> src/worker.py")
+@click.option("-r",  "--resume", is_flag=True, help="batch: continue the unfinished jobs of an interrupted run")
 @click.option("-a",  "--audio", is_flag=True, help="only audio track")
 @click.option("-l",  "--language", help="force audio language 'de', 'en', 'null'", default="")
 @click.option("-d",  "--debug", is_flag=True, help="debug: show web traffic")
 
-def main(youtube_id: str, audio: bool, language: str, debug: bool) -> None:
-    if audio:
-        _ret = download_video(youtube_id, DEST_AUDIO, True, language, debug)
+def main(youtube_id: List[str], id_file: TextIOWrapper | None, from_info_json: Path | None, workers: int, metadata_workers: int, *, host_limit: int, adaptive: bool, enqueue: bool, resume: bool, audio: bool, language: str, debug: bool) -> None:
+    dest = DEST_AUDIO if audio else DEST_VIDEO
+
+    if from_info_json is not None:
+        info = import_json(from_info_json.parent, from_info_json.name) # also '.json.gz', '.json.zst'
+        if info is None:
+            return
+
+        info = expand_info(info)
+
+        if not is_info_valid(info, Prefs.get("info_json.expire_margin")):
+            Trace.warning(f"info json expired '{from_info_json.name}' -> new extraction")
+            _ret = download_video(info["id"], dest, audio, language, debug)
+        else:
+            _ret = download_video(info["id"], dest, audio, language, debug, info=info)
+        return
+
+    youtube_ids = list(youtube_id)
+
+    if id_file is not None:
+        for value in read_ids(id_file):
+            try:
+                youtube_ids.append(parse_id(value))
+            except click.BadParameter as err:
+                Trace.error(f"id file: '{value}' {err.message}")
+
+    if len(youtube_ids) == 0 and id_file is None and not resume:
+        youtube_ids.append(click.prompt("Youtube ID (11 char)", value_proc=parse_id))
+
+    if enqueue:
+        enqueue_ids(youtube_ids, dest, audio, language, debug)
+        return
+
+    if len(youtube_ids) == 1 and not is_collection_url(youtube_ids[0]) and not resume:
+        _ret = download_video(youtube_ids[0], dest, audio, language, debug)
     else:
-        _ret = download_video(youtube_id, DEST_VIDEO, False, language, debug)
+        jobs = run_batch(youtube_ids, dest, audio, language, debug, workers=workers, metadata_workers=metadata_workers, host_limit=host_limit, resume=resume, adaptive=adaptive)
+        report_batch(jobs)
 
 if __name__ == "__main__":
     Trace.set(debug_mode=True, show_caller=False, timezone=False)
@@ -0,0 +1,71 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 17:30
+
+    src/sync.py
+
+    uv run src/sync.py -c "https://www.youtube.com/@<channel>"
+    uv run src/sync.py -c @<channel> -c @<channel> -w 4
+    uv run src/sync.py -f channels.txt -w 4
+    uv run src/sync.py -f channels.txt -n 10 -w 4   # first sync: only the 10 newest videos
+"""
+from __future__ import annotations
+
+import sys
+
+from typing import TYPE_CHECKING, List
+
+import click
+
+# helper
+from src.helper.batch import read_ids, report_batch
+from src.helper.sync import sync_channels
+
+# utils
+from src.utils.globals import BASE_PATH
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+if TYPE_CHECKING:
+    from io import TextIOWrapper
+
+DEST_VIDEO = BASE_PATH / "data" / "video"
+DEST_AUDIO = BASE_PATH / "data" / "audio"
+
+@click.command()
+@click.option("-c",  "--channel", multiple=True, help="channel url or '@handle' (repeatable)")
+@click.option("-f",  "--channel_file", type=click.File("r", encoding="utf-8"), help="file with channel urls - one per line ('-' = stdin)")
+@click.option("-n",  "--limit", type=click.IntRange(0), default=0, help="first sync of a channel: max. number of videos (0 = all)")
+@click.option("-w",  "--workers", type=click.IntRange(1, 32), default=1, help="parallel downloads")
+@click.option("-m",  "--metadata_workers", type=click.IntRange(1, 32), default=2, help="parallel metadata requests")
+@click.option("--host_limit", type=click.IntRange(1, 32), default=2, help="parallel downloads per googlevideo edge host")
+@click.option("-a",  "--audio", is_flag=True, help="only audio track")
+@click.option("-l",  "--language", help="force audio language 'de', 'en', 'null'", default="")
+@click.option("-d",  "--debug", is_flag=True, help="debug: show web traffic")
+
+def main(channel: List[str], channel_file: TextIOWrapper | None, limit: int, workers: int, metadata_workers: int, *, host_limit: int, audio: bool, language: str, debug: bool) -> None:
+    dest = DEST_AUDIO if audio else DEST_VIDEO
+
+    urls = list(channel)
+    if channel_file is not None:
+        urls += read_ids(channel_file)
+
+    if len(urls) == 0:
+        Trace.error("no channel (-c / -f)")
+        return
+
+    jobs = sync_channels(urls, dest, audio, language, debug, workers=workers, metadata_workers=metadata_workers, host_limit=host_limit, limit=limit)
+    report_batch(jobs)
+
+if __name__ == "__main__":
+    Trace.set(debug_mode=True, show_caller=False, timezone=False)
+    Trace.action(f"Python version {sys.version}")
+
+    Prefs.init("settings")
+    Prefs.load("settings.yaml")
+
+    try:
+        main()
+    except KeyboardInterrupt:
+        print()
+        Trace.exception("KeyboardInterrupt")
+        sys.exit()
@@ -31,12 +31,16 @@
      - get_folders_in_folder(path: Path) -> List[str]
      - get_save_filename(path: Path, stem: str, suffix: str) -> str
 
-     - import_text(folderpath: Path | str, filename: Path | str, encoding: str="utf-8", show_error: bool=True) -> str | None
+     - import_text(folderpath: Path | str, filename: Path | str, encoding: str="utf-8", show_error: bool=True) -> str | None # '.gz', '.zst' -> decompressed
      - import_json(folderpath: Path | str, filename: Path | str, show_error: bool=True) -> Any
      - import_json_timestamp(folderpath: Path | str, filename: Path | str, show_error: bool=True) -> Tuple[Any, float | None]
 
      - export_text(folderpath: Path | str, filename: Path | str, text: str, encoding: str="utf-8", newline: str="\n", timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True) -> bool | None:
-     - export_json(folderpath: Path | str, filename: Path | str, data: Dict[str, Any] | List[Any], newline: str="\n", timestamp: float=0.0, show_message: bool=True) -> bool | None:
+     - export_json(folderpath: Path | str, filename: Path | str, data: Dict[str, Any] | List[Any], newline: str="\n", timestamp: float=0.0, show_message: bool=True, minified: bool=False) -> bool | None: # '.gz', '.zst' -> compressed
+     - export_compressed(folderpath: Path | str, filename: Path | str, data: bytes, *, timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True) -> bool | None
+     - compress_data(data: bytes, suffix: str) -> bytes
+     - decompress_data(data: bytes, suffix: str) -> bytes
+     - zstd_module() -> Any | None
      - export_binary_file(filepath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False) -> bool | None
      - export_file(filepath: Path|str, filename: Path | str, text: str, in_type: str | None = None, timestamp: float=0, create_new_folder: bool=True, encoding: str ="utf-8", newline: str="\n", overwrite: bool=True) -> None | str
     #
@@ -56,11 +60,16 @@
 
 import datetime
 import filecmp
+import gzip
 import hashlib
+import importlib
+import importlib.util
 import json
 import os
 import re
 import shutil
+import sys
+import zlib
 
 from pathlib import Path
 from re import Match
@@ -69,6 +78,8 @@
 # utils
 from src.utils.trace import Trace, normalize_path
 
+COMPRESSED = {".gz", ".zst"}
+
 # timestamp
 
 def get_modification_timestamp(filepath: Path | str) -> float:
@@ -286,8 +297,11 @@ def import_text(folderpath: Path | str, filename: Path | str, encoding: str="utf
 
     if filepath.is_file():
         try:
-            with filepath.open(mode="r", encoding=encoding) as f:
-                data = f.read()
+            if filepath.suffix in COMPRESSED:
+                data = decompress_data(filepath.read_bytes(), filepath.suffix).decode(encoding)
+            else:
+                with filepath.open(mode="r", encoding=encoding) as f:
+                    data = f.read()
 
         except OSError as e:
             Trace.error(f"{e}")
@@ -297,6 +311,10 @@ def import_text(folderpath: Path | str, filename: Path | str, encoding: str="utf
             Trace.error(f"{normalize_path(filepath)}: {e}")
             return None
 
+        except (ValueError, EOFError, zlib.error) as e: # compressed data
+            Trace.error(f"{normalize_path(filepath)}: {e}")
+            return None
+
         return data
 
     else:
@@ -374,15 +392,82 @@ def export_text(folderpath: Path | str, filename: Path | str, text: str, encodin
         Trace.error(f"{msg} - {normalize_path(filepath)}")
         return None
 
-def export_json(folderpath: Path | str, filename: Path | str, data: Any, newline: str="\n", timestamp: float=0.0, show_message: bool=True) -> bool | None:
+def export_json(folderpath: Path | str, filename: Path | str, data: Any, newline: str="\n", timestamp: float=0.0, show_message: bool=True, minified: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
     filename   = filepath.name
 
-    text = json.dumps(data, ensure_ascii=False, indent=2)
+    if minified:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+
+    if filepath.suffix in COMPRESSED:
+        return export_compressed(folderpath, filename, text.encode("utf-8"), timestamp=timestamp, show_message=show_message)
 
     return export_text(folderpath, filename, text, encoding="utf-8", newline=newline, timestamp=timestamp, show_message=show_message)
 
+# compressed files: suffix '.gz' (gzip) or '.zst' (zstd: Python 3.14 'compression.zstd' or package 'zstandard')
+
+def zstd_module() -> Any | None:
+    if sys.version_info >= (3, 14):
+        return importlib.import_module("compression.zstd")
+    if importlib.util.find_spec("zstandard") is not None:
+        return importlib.import_module("zstandard")
+    return None
+
+def compress_data(data: bytes, suffix: str) -> bytes:
+    if suffix == ".gz":
+        return gzip.compress(data, compresslevel=6, mtime=0) # mtime 0 -> same data, same file
+    zstd = zstd_module()
+    if zstd is None:
+        msg = "zstd: Python 3.14 or 'uv add zstandard' needed"
+        raise ValueError(msg)
+    return zstd.compress(data)
+
+def decompress_data(data: bytes, suffix: str) -> bytes:
+    if suffix == ".gz":
+        return gzip.decompress(data)
+    zstd = zstd_module()
+    if zstd is None:
+        msg = "zstd: Python 3.14 or 'uv add zstandard' needed"
+        raise ValueError(msg)
+    return zstd.decompress(data)
+
+def export_compressed(folderpath: Path | str, filename: Path | str, data: bytes, *, timestamp: float=0.0, create_new_folder: bool=True, show_message: bool=True) -> bool | None:
+    filepath = Path(folderpath).resolve() / filename
+
+    try:
+        compressed = compress_data(data, filepath.suffix)
+    except ValueError as e:
+        Trace.error(f"{e} - {normalize_path(filepath)}")
+        return None
+
+    exist = filepath.is_file()
+    if exist and filepath.read_bytes() == compressed:
+        if show_message:
+            Trace.info(f"not changed '{normalize_path(filepath)}'")
+        return False
+
+    if create_new_folder:
+        create_folder(filepath.parent)
+
+    try:
+        filepath.write_bytes(compressed)
+
+        if timestamp != 0:
+            set_modification_timestamp(filepath, timestamp)
+
+        if show_message:
+            Trace.update(f"{'changed' if exist else 'created'} '{normalize_path(filepath)}' ({len(data) // 1024} -> {len(compressed) // 1024} KB)")
+
+        return True
+
+    except OSError as e:
+        msg = str(e).split(":")[0]
+        Trace.error(f"{msg} - {normalize_path(filepath)}")
+        return None
+
 def export_binary_file(folderpath: Path | str, filename: Path | str, data: bytes, _timestamp: float=0, create_new_folder: bool=False) -> bool | None:
     filepath   = Path(folderpath) / filename
     folderpath = filepath.parent
@@ -0,0 +1,146 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 23:05
+
+    src/utils/json_fields.py
+
+    selective json parser: only the top-level fields of a spec are decoded
+     - no streaming: the whole file is read into memory (import_text), the saving is the decoding
+     - other top-level values are skipped by a scanner (strings, brackets) without building python objects
+     - scan stops as soon as all fields are found
+       -> info json (~600 KB): 'id', 'title', 'formats', 'duration' are at the beginning,
+          'automatic_captions', 'subtitles', 'heatmap' are never decoded
+     - nested values: decoded completely (C json decoder), then cut down to the fields of the nested spec
+       -> 'formats' is built with all its fields (a scanner in python is slower than the C decoder)
+
+    spec:
+     - { "key": True }          -> value
+     - { "key": { ... } }       -> object, only the fields of the nested spec
+     - { "key": [ { ... } ] }   -> array of objects, only the fields of the nested spec
+
+    PUBLIC:
+     - parse_fields(text: str, spec: Dict[str, Any]) -> Dict[str, Any]
+     - import_json_fields(folderpath: Path | str, filename: Path | str, spec: Dict[str, Any], show_error: bool = True) -> Dict[str, Any] | None
+
+    PRIVATE:
+     - project(value: Any, spec: Any) -> Any
+     - skip_value(text: str, pos: int) -> int
+"""
+from __future__ import annotations
+
+import json
+import re
+
+from pathlib import Path
+from typing import Any, Dict
+
+# utils
+from src.utils.file import import_text
+from src.utils.trace import Trace
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+STRING     = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+LITERAL    = re.compile(r"[-+0-9.eE]+|true|false|null")
+NO_BRACKET = re.compile(r'[^"\[\]{}]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\[\]{}]*)*', re.DOTALL) # up to the next bracket (outside of strings)
+
+decoder = json.JSONDecoder()
+
+def import_json_fields(folderpath: Path | str, filename: Path | str, spec: Dict[str, Any], show_error: bool = True) -> Dict[str, Any] | None:
+    filepath = Path(folderpath) / filename
+
+    text = import_text(filepath.parent, filepath.name, show_error=show_error)
+    if text is None:
+        return None
+
+    try:
+        return parse_fields(text, spec)
+    except ValueError as err: # json.JSONDecodeError is a ValueError
+        Trace.error(f"{filepath.name}: {err}")
+        return None
+
+def parse_fields(text: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    pos = WHITESPACE.match(text, 0).end() # type: ignore[union-attr]
+    if text[pos:pos + 1] != "{":
+        msg = f"object expected at {pos}"
+        raise ValueError(msg)
+
+    result: Dict[str, Any] = {}
+    pos = WHITESPACE.match(text, pos + 1).end() # type: ignore[union-attr]
+    if text[pos:pos + 1] == "}":
+        return result
+
+    while True:
+        match = STRING.match(text, pos)
+        if match is None:
+            msg = f"key expected at {pos}"
+            raise ValueError(msg)
+
+        key = match.group()[1:-1]
+        if "\\" in key:
+            key = json.loads(match.group())
+
+        pos = WHITESPACE.match(text, match.end()).end() # type: ignore[union-attr]
+        if text[pos:pos + 1] != ":":
+            msg = f"':' expected at {pos}"
+            raise ValueError(msg)
+        pos = WHITESPACE.match(text, pos + 1).end() # type: ignore[union-attr]
+
+        if key in spec:
+            value, pos = decoder.raw_decode(text, pos)
+            result[key] = project(value, spec[key])
+
+            if len(result) == len(spec):
+                return result # rest of the document is not scanned
+        else:
+            pos = skip_value(text, pos)
+
+        pos = WHITESPACE.match(text, pos).end() # type: ignore[union-attr]
+        char = text[pos:pos + 1]
+        if char == "}":
+            return result
+        if char != ",":
+            msg = f"',' or '}}' expected at {pos}"
+            raise ValueError(msg)
+        pos = WHITESPACE.match(text, pos + 1).end() # type: ignore[union-attr]
+
+def project(value: Any, spec: Any) -> Any:
+    if isinstance(spec, dict) and isinstance(value, dict):
+        return {key: project(value[key], spec[key]) for key in spec if key in value}
+
+    if isinstance(spec, list) and isinstance(value, list):
+        return [project(item, spec[0]) for item in value]
+
+    return value
+
+# end of the value at pos (not decoded)
+
+def skip_value(text: str, pos: int) -> int:
+    char = text[pos:pos + 1]
+
+    if char == '"':
+        match = STRING.match(text, pos)
+        if match is None:
+            msg = f"unterminated string at {pos}"
+            raise ValueError(msg)
+        return match.end()
+
+    if char in {"{", "["}:
+        start = pos
+        depth = 0
+        while True:
+            bracket = text[pos:pos + 1]
+            if bracket in {"{", "["}:
+                depth += 1
+            elif bracket in {"}", "]"}:
+                depth -= 1
+                if depth == 0:
+                    return pos + 1
+            else:
+                msg = f"unterminated {char} at {start}"
+                raise ValueError(msg)
+            pos = NO_BRACKET.match(text, pos + 1).end() # type: ignore[union-attr]
+
+    match = LITERAL.match(text, pos)
+    if match is None:
+        msg = f"value expected at {pos}"
+        raise ValueError(msg)
+    return match.end()
@@ -0,0 +1,58 @@
+"""
+    © Jürgen Schoenemeyer, 18.10.2026 20:00
+
+    src/worker.py
+
+    several hosts, shared output tree (settings.yaml 'queue.shared: true'):
+
+    uv run src/main.py -q -f ids.txt          # enqueue only
+    uv run src/worker.py -w 4                 # on each host: work until the queue is empty
+    uv run src/worker.py -w 4 --follow        # on each host: wait for new jobs
+    uv run src/worker.py -a                   # audio queue (data/audio/jobs.sqlite)
+"""
+from __future__ import annotations
+
+import sys
+
+import click
+
+# helper
+from src.helper.batch import report_batch
+from src.helper.worker import run_worker
+
+# utils
+from src.utils.globals import BASE_PATH
+from src.utils.prefs import Prefs
+from src.utils.trace import Trace
+
+DEST_VIDEO = BASE_PATH / "data" / "video"
+DEST_AUDIO = BASE_PATH / "data" / "audio"
+
+@click.command()
+@click.option("-w",  "--workers", type=click.IntRange(1, 32), default=1, help="parallel downloads")
+@click.option("-m",  "--metadata_workers", type=click.IntRange(1, 32), default=2, help="parallel metadata requests")
+@click.option("--host_limit", type=click.IntRange(1, 32), default=2, help="parallel downloads per googlevideo edge host")
+@click.option("--adaptive", is_flag=True, help="adaptive concurrency (AIMD): -w / -m are the maximum")
+@click.option("--follow", is_flag=True, help="wait for new jobs (do not stop at an empty queue)")
+@click.option("-a",  "--audio", is_flag=True, help="audio queue")
+@click.option("-d",  "--debug", is_flag=True, help="debug: show web traffic")
+
+def main(workers: int, metadata_workers: int, host_limit: int, adaptive: bool, follow: bool, *, audio: bool, debug: bool) -> None:
+    dest = DEST_AUDIO if audio else DEST_VIDEO
+
+    jobs = run_worker(dest, debug, workers=workers, metadata_workers=metadata_workers, host_limit=host_limit, follow=follow, adaptive=adaptive)
+    report_batch(jobs)
+
+if __name__ == "__main__":
+    Trace.set(debug_mode=True, show_caller=False, timezone=False)
+    Trace.action(f"Python version {sys.version}")
+
+    Prefs.init("settings")
+    Prefs.load("settings.yaml")
+
+    try:
+        main()
+    except KeyboardInterrupt:
+        print()
+        Trace.exception("KeyboardInterrupt")
+        sys.exit()
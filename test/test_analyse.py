@@ -0,0 +1,87 @@
+"""
+    src/helper/analyse.py
+
+    python -m pytest test
+"""
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+# helper
+from src.helper.analyse import select_languages, select_tracks
+
+# utils
+from src.utils.prefs import Prefs
+
+DATA = Path(__file__).parent / "data"
+
+FILES = sorted(DATA.glob("*.json"))
+
+@pytest.fixture(scope="module", autouse=True)
+def settings() -> None:
+    Prefs.init(Path(__file__).parents[1] / "settings")
+    Prefs.load("settings.yaml")
+
+def load_sample(pattern: str) -> Dict[str, Any]:
+    return json.loads(next(DATA.glob(pattern)).read_text(encoding="utf-8"))
+
+# all codecs
+
+@pytest.mark.parametrize("details", [True, False])
+def test_dolby_codecs_kept(details: bool) -> None:
+    result = select_tracks(load_sample("Exodus*.json"), details=details)
+
+    assert result["audio"]["ac-3"][0] == "380"
+    assert result["audio"]["ec-3"][0] == "328"
+
+def test_dolby_codecs_all_languages() -> None:
+    assert "ec-3" in select_languages(load_sample("Exodus*.json"))["languages"]["de"]
+
+def test_codec_not_in_settings() -> None:
+    info = load_sample("Fremde Welten*.json")
+    for format in info["formats"]:
+        if format.get("acodec", "none").startswith("opus"):
+            format["acodec"] = "flac"
+
+    result = select_tracks(info)
+    assert "flac" in result["audio"]
+    assert "opus" not in result["audio"]
+
+# select_tracks
+
+@pytest.mark.parametrize("language", ["", "de", "en"])
+@pytest.mark.parametrize("file", FILES, ids=[file.stem[:30] for file in FILES])
+def test_details_same_selection(file: Path, language: str) -> None:
+    info = json.loads(file.read_text(encoding="utf-8"))
+
+    result = select_tracks(info, language)
+    result_fast = select_tracks(info, language, details=False)
+
+    assert result_fast.pop("tracks") == {"video": {}, "audio": {}}
+    result.pop("tracks")
+    assert result_fast == result
+
+def test_languages() -> None:
+    info = load_sample("multi-language*.json")
+
+    result = select_tracks(info)
+    assert result["language"] == result["original_language"]
+    assert list(result["tracks"]["audio"]) == [result["language"]]
+    assert len(result["languages_skipped"]) > 0
+
+    forced = select_tracks(info, "de")
+    assert forced["language"].startswith("de")
+    assert forced["language"] not in forced["languages_skipped"]
+
+def test_protocols() -> None:
+    info = load_sample("Fremde Welten*.json")
+    info["formats"][0] = info["formats"][0] | {"protocol": "rtmp", "acodec": "mp4a.40.2"}
+
+    result = select_tracks(info, details=False)
+    assert result["protocols_unknown"] == ["rtmp"]
+    assert result["protocols_skipped"].get("m3u8_native", 0) > 0
@@ -0,0 +1,72 @@
+"""
+    src/utils/json_fields.py
+
+    python -m pytest test
+"""
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+
+import pytest
+
+# utils
+from src.utils.json_fields import parse_fields, project, skip_value
+
+DATA = Path(__file__).parent / "data"
+
+FILES = sorted(DATA.glob("*.json"))
+
+INFO_SPEC = {
+    "id":       True,
+    "title":    True,
+    "channel":  True,
+    "duration": True,
+    "language": True,
+    "formats":  [{"format_id": True, "vcodec": True, "acodec": True, "language": True}],
+}
+
+# skip_value
+
+def test_brackets_in_strings() -> None:
+    text = r'{"a": "}]", "b": ["[{", "\"}", {"c": "\\"}], "d": 1}'
+    start = text.index("[")
+    end = skip_value(text, start)
+    assert json.loads(text[start:end]) == ["[{", '"}', {"c": "\\"}]
+
+def test_escaped_quotes() -> None:
+    text = r'"say \"}\" and \\" , 1'
+    assert skip_value(text, 0) == text.index(" ,")
+
+@pytest.mark.parametrize("text", ['["a", {"b": 1}', '"abc', '{"a": "]}'])
+def test_unterminated(text: str) -> None:
+    with pytest.raises(ValueError, match="unterminated"):
+        skip_value(text, 0)
+
+# parse_fields
+
+def test_skipped_strings_with_brackets() -> None:
+    text = r'{"skip": {"x": "}\"]", "y": ["{\\"]}, "skip2": "\"{", "keep": {"a": 1, "b": "]"}, "last": true}'
+    assert parse_fields(text, {"keep": {"b": True}, "last": True}) == {"keep": {"b": "]"}, "last": True}
+
+def test_escaped_key() -> None:
+    text = r'{"k\u0065y": 1, "\"other\"": 2}'
+    assert parse_fields(text, {"key": True, '"other"': True}) == {"key": 1, '"other"': 2}
+
+def test_missing_fields() -> None:
+    assert parse_fields('{"a": [1, {"b": "}"}]}', {"a": True, "c": True}) == {"a": [1, {"b": "}"}]}
+    assert parse_fields(" { } ", {"a": True}) == {}
+
+@pytest.mark.parametrize("text", ["[]", '{"a" 1}', '{"a": 1 "b": 2}', "{a: 1}"])
+def test_invalid(text: str) -> None:
+    with pytest.raises(ValueError, match="expected"):
+        parse_fields(text, {"b": True})
+
+@pytest.mark.parametrize("file", FILES, ids=[file.stem[:30] for file in FILES])
+def test_same_as_json_loads(file: Path) -> None:
+    text = file.read_text(encoding="utf-8")
+    full = json.loads(text)
+
+    expected = {key: project(full[key], INFO_SPEC[key]) for key in INFO_SPEC if key in full}
+    assert parse_fields(text, INFO_SPEC) == expected
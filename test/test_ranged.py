@@ -0,0 +1,160 @@
+"""
+    src/helper/ranged.py
+
+    python -m pytest test
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any, ClassVar, List, Set, Tuple
+
+import pytest
+
+# helper
+from src.helper import ranged
+from src.helper.ranged import JOURNAL_SUFFIX, download_ranged
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+PAYLOAD    = os.urandom(256 * 1024 + 123) # last chunk shorter
+CHUNK_SIZE = 64 * 1024
+BLOCK_SIZE = 4 * 1024 # small blocks -> a dropped connection leaves a partly written chunk
+
+CHUNKS = ranged.split_chunks(len(PAYLOAD), CHUNK_SIZE)
+
+# 'Range: bytes=start-end' -> 206
+#  - mode "drop": first request of each chunk: connection closed after half of the range
+#  - mode "expired": 403, mode "no_ranges": 200 + whole file
+
+class RangeHandler(BaseHTTPRequestHandler):
+    requests: ClassVar[List[Tuple[int, int]]] = []
+    dropped:  ClassVar[Set[int]] = set()
+    mode:     ClassVar[str] = "drop"
+    lock:     ClassVar[threading.Lock] = threading.Lock()
+
+    def do_GET(self) -> None:
+        if self.mode == "expired":
+            self.send_error(403)
+            return
+
+        if self.mode == "no_ranges" or "Range" not in self.headers:
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(PAYLOAD)))
+            self.end_headers()
+            self.wfile.write(PAYLOAD)
+            return
+
+        start, end = (int(value) for value in self.headers["Range"].removeprefix("bytes=").split("-"))
+        with self.lock:
+            self.requests.append((start, end))
+            drop = self.mode == "drop" and start % CHUNK_SIZE == 0 and start not in self.dropped
+            if drop:
+                self.dropped.add(start)
+
+        data = PAYLOAD[start:end + 1]
+        self.send_response(206)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Content-Range", f"bytes {start}-{end}/{len(PAYLOAD)}")
+        self.end_headers()
+
+        if drop:
+            self.wfile.write(data[:len(data) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+        else:
+            self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+@pytest.fixture(scope="module")
+def url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}/video.mp4"
+
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def filepath(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    RangeHandler.requests.clear()
+    RangeHandler.dropped.clear()
+    RangeHandler.mode = "drop"
+
+    monkeypatch.setattr(ranged, "BLOCK_SIZE", BLOCK_SIZE)
+    monkeypatch.setattr(ranged.time, "sleep", lambda _seconds: None)
+
+    return tmp_path / "video.mp4"
+
+def download(url: str, filepath: Path) -> bool:
+    return download_ranged(url, filepath, len(PAYLOAD), connections=4, chunk_size=CHUNK_SIZE, retries=3)
+
+def write_journal(filepath: Path, filesize: int, done: List[int]) -> None:
+    journal = {"filesize": filesize, "chunk_size": CHUNK_SIZE, "done": done}
+    filepath.with_name(filepath.name + JOURNAL_SUFFIX).write_text(json.dumps(journal), encoding="utf-8")
+
+def test_retry_resumes_inside_chunk(url: str, filepath: Path) -> None:
+    assert download(url, filepath)
+    assert filepath.read_bytes() == PAYLOAD
+    assert not filepath.with_name(filepath.name + JOURNAL_SUFFIX).exists()
+
+    assert RangeHandler.dropped == {start for start, _ in CHUNKS}
+
+    # retry: same end, start after the bytes already written
+
+    retries = [(start, end) for start, end in RangeHandler.requests if start % CHUNK_SIZE != 0]
+    assert len(retries) == len(CHUNKS)
+    for start, end in retries:
+        assert (start - start % CHUNK_SIZE, end) in CHUNKS
+
+def test_resume_from_journal(url: str, filepath: Path) -> None:
+    RangeHandler.mode = "ok"
+    done = [0, CHUNK_SIZE]
+
+    part_path = filepath.with_name(filepath.name + ".part")
+    part_path.write_bytes(PAYLOAD[:2 * CHUNK_SIZE] + bytes(len(PAYLOAD) - 2 * CHUNK_SIZE))
+    write_journal(filepath, len(PAYLOAD), done)
+
+    assert download(url, filepath)
+    assert filepath.read_bytes() == PAYLOAD
+    assert not part_path.exists()
+
+    requested = {start for start, _ in RangeHandler.requests}
+    assert requested == {start for start, _ in CHUNKS} - set(done)
+
+def test_journal_of_other_filesize_restarts(url: str, filepath: Path) -> None:
+    RangeHandler.mode = "ok"
+
+    filepath.with_name(filepath.name + ".part").write_bytes(bytes(len(PAYLOAD)))
+    write_journal(filepath, len(PAYLOAD) + 1, [0])
+
+    assert download(url, filepath)
+    assert filepath.read_bytes() == PAYLOAD
+    assert 0 in {start for start, _ in RangeHandler.requests}
+
+def test_expired_url_no_retry(url: str, filepath: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    RangeHandler.mode = "expired"
+
+    sleeps: List[float] = []
+    monkeypatch.setattr(ranged.time, "sleep", sleeps.append)
+
+    assert not download(url, filepath)
+    assert sleeps == []
+    assert not filepath.with_name(filepath.name + ".part").exists()
+    assert not filepath.with_name(filepath.name + JOURNAL_SUFFIX).exists()
+
+def test_no_range_support_single_stream(url: str, filepath: Path) -> None:
+    RangeHandler.mode = "no_ranges"
+
+    progress: List[int] = []
+    assert download_ranged(url, filepath, len(PAYLOAD), connections=4, chunk_size=CHUNK_SIZE, retries=3, progress=progress.append)
+    assert filepath.read_bytes() == PAYLOAD
+    assert progress[-1] == len(PAYLOAD)
@@ -0,0 +1,47 @@
+"""
+    src/helper/youtube.py
+
+    python -m pytest test
+"""
+from __future__ import annotations
+
+import json
+
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+import yt_dlp  # type: ignore[import-untyped]
+
+# helper
+from src.helper.youtube import reset_selection
+
+SAMPLE = next((Path(__file__).parent / "data").glob("Fremde Welten*.json"))
+
+YT_OPTS = {"quiet": True, "simulate": True, "skip_download": True}
+
+# step 1: extract_info(download=False) -> default selection (video + audio, also without ffmpeg)
+
+@pytest.fixture
+def info() -> Dict[str, Any]:
+    data = json.loads(SAMPLE.read_text(encoding="utf-8"))
+    data.pop("requested_formats", None)
+
+    with yt_dlp.YoutubeDL(YT_OPTS | {"format": "bestvideo*+bestaudio/best"}) as ydl:
+        return ydl.process_ie_result(data, download=False)
+
+def test_step1_selects_video_and_audio(info: Dict[str, Any]) -> None:
+    assert len(info["requested_formats"]) == 2
+
+def test_audio_only_format(info: Dict[str, Any]) -> None:
+    with yt_dlp.YoutubeDL(YT_OPTS | {"format": "251"}) as ydl:
+        selected = ydl.process_ie_result(reset_selection(info), download=False)
+
+    assert selected["format_id"] == "251"
+    assert "requested_formats" not in selected
+
+def test_video_and_audio_format(info: Dict[str, Any]) -> None:
+    with yt_dlp.YoutubeDL(YT_OPTS | {"format": "303+251"}) as ydl:
+        selected = ydl.process_ie_result(reset_selection(info), download=False)
+
+    assert [format["format_id"] for format in selected["requested_formats"]] == ["303", "251"]